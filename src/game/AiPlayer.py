@@ -1,21 +1,79 @@
 import random
 import math
 import time
-from typing import Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+from game.TranspositionTable import TranspositionTable, SharedTranspositionTable
+from game.OpeningBook import OpeningBook
+from game.Solver import Solver, SolutionCache
+from game.ParallelSearch import ParallelSearch, LazySMP, Ponderer
+
+
+class SearchAborted(Exception):
+    """Raised inside the search when its time or node budget runs out."""
+
 
 class AiPlayer:
     """
     AI player for Connect Four using minimax algorithm with alpha-beta pruning.
     """
     
-    def __init__(self, player_id: int, depth: int = 5):
+    CHECK_INTERVAL = 256  # nodes between two checks of the search budget
+    SOLVER_BUDGET_SHARE = 0.5  # part of a time or node budget the endgame solver may use
+    CENTER_ORDER = (4, 3, 5, 2, 6, 1, 7)  # static fallback move order, center first
+    MAX_PLY = 42  # killer slots, indexed by the number of pieces on the board
+    ENGINES = ("minimax", "pvs", "mtdf", "solver", "bitboard")
+    PARALLEL_MODES = ("root", "lazy_smp")
+
+    def __init__(self, player_id: int, depth: int = 5, batch_leaves: bool = False, tt_size_mb: float = 16,
+                 time_limit_ms: Optional[float] = None, max_nodes: Optional[int] = None,
+                 move_ordering: bool = True, engine: str = "minimax", mtdf_step: int = 1,
+                 mtdf_bisect: bool = False, tactics: bool = True, book_path: Optional[str] = None,
+                 endgame_threshold: int = 16, solution_cache: Optional[str] = None,
+                 workers: int = 1, seed: int = 0, parallel: str = "root", ponder: bool = False,
+                 eval_weights: Optional[Tuple[Sequence[int], Sequence[int]]] = None):
         """
         Initialize AI player.
         
         Args:
             player_id: Player's ID number (1 or 2)
             difficulty: Depth for minimax algorithm (default 5)
+            batch_leaves: Score all children of depth-1 nodes in one vectorized call
+            tt_size_mb: Size of the transposition table in MB (0 disables it)
+            time_limit_ms: Search by iterative deepening for this long instead of a fixed depth
+            max_nodes: Search by iterative deepening until this many nodes are visited
+            move_ordering: Order moves by hash move, tactics, killers and history
+            engine: Search algorithm, "minimax" (alpha-beta), "pvs" (negamax principal
+                variation search), "mtdf" (MTD(f) zero-window driver), "solver"
+                (perfect play: weak solve of every move, slow in the opening) or
+                "bitboard" (plain alpha-beta on a BitBoard, without table, tactics
+                or move ordering)
+            mtdf_step: Initial MTD(f) step between zero-window tests, halved whenever
+                the search changes direction (1 is plain MTD(f))
+            mtdf_bisect: Test the middle of the bounds once both are known
+            tactics: Resolve immediate wins, forced blocks and losing moves before branching
+            book_path: Opening book file (see OpeningBook) to play from before searching
+            endgame_threshold: Solve the game exactly instead of searching once at most
+                this many cells are empty (0 disables the endgame solver)
+            solution_cache: SolutionCache file shared by the solver across runs
+            workers: Search with this many processes
+            seed: Seed of the random tie-breaks of the parallel workers
+            parallel: How workers share the search: "root" splits the root moves of
+                fixed-depth searches (see ParallelSearch), "lazy_smp" runs the whole
+                search in every worker around a shared-memory table (see LazySMP)
+            ponder: Search the opponent's replies in a background process while it
+                thinks (see start_pondering); the transposition table is then a
+                SharedTranspositionTable, shared with that process
+            eval_weights: Evaluate with other weights than the board's: a tuple
+                (window weights by number of own pieces, center weights by column),
+                see Board.evaluation_tables. Slower than the default incremental evaluation
+                (the "bitboard" engine evaluates them with BitBoard.weighted_score)
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {self.ENGINES}")
+        if parallel not in self.PARALLEL_MODES:
+            raise ValueError(f"Unknown parallel mode {parallel!r}, expected one of {self.PARALLEL_MODES}")
+        if parallel == "lazy_smp" and workers > 1 and not tt_size_mb:
+            raise ValueError("Lazy SMP needs a transposition table (tt_size_mb > 0)")
         self.player_id = player_id
         self.opponent_id = 3 - player_id
         self.name = f"Player {player_id} (AI)"
@@ -24,6 +82,52 @@ class AiPlayer:
         self.move_times = []
         self.last_move_time = 0.0
         self.nodes_evaluated = 0  # Counter for nodes evaluated
+        self.batch_leaves = batch_leaves
+        self.tt_size_mb = tt_size_mb
+        if tt_size_mb and ((parallel == "lazy_smp" and workers > 1) or ponder):
+            self.tt = SharedTranspositionTable(tt_size_mb)
+        else:
+            self.tt = TranspositionTable(tt_size_mb) if tt_size_mb else None
+        self.time_limit_ms = time_limit_ms
+        self.max_nodes = max_nodes
+        self.last_search_depth = 0  # deepest iteration completed by the last move
+        self._deadline: Optional[float] = None
+        self._next_check = math.inf  # node count at which the budget is checked next
+        self.move_ordering = move_ordering
+        self._center_rank = {c: i for i, c in enumerate(self.CENTER_ORDER)}
+        self.killers = [[0, 0] for _ in range(self.MAX_PLY + 1)]
+        self.history = [[0] * 8 for _ in range(3)]  # [player_id][column] cutoff scores
+        self.cutoffs = 0  # beta cutoffs in the last search
+        self.first_move_cutoffs = 0  # cutoffs caused by the first move tried
+        self.engine = engine
+        self.mtdf_step = max(1, mtdf_step)
+        self.mtdf_bisect = mtdf_bisect
+        self.mtdf_guess = 0  # first guess of the next MTD(f) search
+        self.mtdf_passes = 0  # zero-window searches run by the last MTD(f) call
+        self.tactics = tactics
+        self.book = OpeningBook(book_path) if book_path else None
+        self.book_hits = 0  # moves played from the opening book
+        self.endgame_threshold = endgame_threshold
+        self.solver = None
+        if endgame_threshold > 0 or engine == "solver":
+            self.solver = Solver(self.tt, cache=SolutionCache(solution_cache) if solution_cache else None)
+        self.solved_moves = 0  # moves chosen by the solver
+        self.workers = workers
+        self.seed = seed
+        self.parallel = parallel
+        self._parallel = None  # ParallelSearch or LazySMP worker pool, started on first use
+        self.worker_nodes: List[int] = []  # nodes of each worker process in the last search
+        self.stop_event = None  # aborts the search when set (see _check_budget)
+        self.cancel_event = None  # set by another thread to abort get_move (see GameGUI)
+        self.ponder = ponder
+        self.ponder_results = {}  # zobrist key after a reply -> (column, score, depth)
+        self.ponder_hits = 0  # moves answered straight from pondering
+        self.ponder_nodes = 0  # nodes searched by the last pondering
+        self._ponderer: Optional[Ponderer] = None  # pondering worker process, started on first use
+        self.pv: List[int] = []  # principal variation of the last move's search
+        self.eval_weights = eval_weights
+        self._eval_tables = None  # built from eval_weights by the first evaluation
+        self._pv_moves = {}  # zobrist key -> PV move, tried right after the hash move
         
     def get_move(self, board):
         """
@@ -34,14 +138,39 @@ class AiPlayer:
             
         Returns:
             Column number for the next move (1-7)
+
+        Raises:
+            SearchAborted: If cancel_event is set during a fixed-depth or
+                multi-process search (the board may then be left with moves
+                played on it); worker processes stop within CANCEL_POLL_S
+                (see ParallelSearch)
         """
         start_time = time.time()
+        self.stop_pondering()
+        pondered = self.ponder_results.pop(board.zobrist_key, None)
+        searched_ahead = bool(self.ponder_results) or pondered is not None  # pondering started this search
+        self.ponder_results = {}
         
-        # Reset node counter before starting search
-        self.nodes_evaluated = 0
-        
-        # Get the best move using minimax with alpha-beta pruning
-        col, _ = self._minimax(board, self.depth, -math.inf, math.inf, True)
+        # Play from the opening book if it knows the position
+        col = self.book.lookup_move(board) if self.book is not None else None
+        if col is not None:
+            self.book_hits += 1
+            self.nodes_evaluated = 0
+        elif pondered is not None and self._ponder_complete(board, pondered[2]):
+            col = pondered[0]
+            self.ponder_hits += 1
+            self.nodes_evaluated = 0
+        else:
+            # Reset node counter and age the cache and ordering tables (unless
+            # pondering already did), then get the best move using the selected engine
+            self._reset_search(new_search=not searched_ahead)
+            if self.cancel_event is not None:
+                self._next_check = self.CHECK_INTERVAL  # watch for cancellation
+            try:
+                col, _ = self._search(board)
+            finally:
+                self._next_check = math.inf
+            self._update_pv(board)
 
         # Record the time taken
         self.last_move_time = time.time() - start_time
@@ -49,12 +178,449 @@ class AiPlayer:
         
         return col
 
+    def start_pondering(self, board) -> None:
+        """
+        Start searching the opponent's replies in a background process (see
+        Ponderer). The process replays the game's moves and runs until
+        stop_pondering() or the next get_move(), which reuses its results and
+        the entries it wrote to the shared transposition table.
+
+        Args:
+            board: The game board object, with the opponent to move
+        """
+        self.stop_pondering()
+        if board.game_over or board.get_current_player().player_id != self.opponent_id or self.engine == "solver":
+            return
+        if board.ROWS * board.COLUMNS - board.total_moves - 1 <= self.endgame_threshold:
+            return  # the solver will answer at once anyway
+        self._reset_search()
+        self.ponder_results = {}
+        if self._ponderer is None:
+            shared_tt = self.tt if isinstance(self.tt, SharedTranspositionTable) else None
+            self._ponderer = Ponderer(dict(self._worker_config(), tt_size_mb=0), shared_tt)
+        self._ponderer.start(board, self.tt.generation if self.tt is not None else 0)
+
+    def stop_pondering(self) -> None:
+        """Stop the background search, if any, and wait for its results."""
+        if self._ponderer is None or not self._ponderer.running:
+            return
+        self.ponder_results, self.ponder_nodes = self._ponderer.finish()
+
+    def _ponder(self, board) -> None:
+        """
+        Pondering search (see search_replies): deepen one ply at a time over
+        all the opponent's replies, most likely first, recording this
+        player's best answer to each.
+        """
+        self._next_check = self.CHECK_INTERVAL
+        replies = self._order_moves(board, board.get_valid_moves(), None)
+        stack_size = len(board.move_stack)
+        try:
+            for depth in range(1, board.ROWS * board.COLUMNS - board.total_moves):
+                for r in replies:
+                    board.play(r)
+                    if not board.game_over:
+                        col, score = self._search_root(board, depth)
+                        self.ponder_results[board.zobrist_key] = (col, score, depth)
+                    board.undo()
+        except SearchAborted:
+            while len(board.move_stack) > stack_size:
+                board.undo()
+        finally:
+            self._next_check = math.inf
+
+    def _ponder_complete(self, board, depth: int) -> bool:
+        """Check if a pondered answer searched to `depth` can be played as it is."""
+        if self.time_limit_ms is not None or self.max_nodes is not None:
+            return False  # the budgeted search gets its head start from the table
+        if self.engine == "solver" or board.ROWS * board.COLUMNS - board.total_moves <= self.endgame_threshold:
+            return False
+        return depth >= self.depth
+
+    def get_move_and_score(self, board) -> Tuple[int, float]:
+        """
+        Search the position with the configured engine and budget, without the book.
+        
+        Args:
+            board: The game board object, with this player to move
+            
+        Returns:
+            Tuple (column, score) with the score from this player's point of view
+            (a Solver score once the solver takes over)
+        """
+        self._reset_search()
+        return self._search(board)
+
+    def _search(self, board) -> Tuple[int, float]:
+        """
+        Solve the position if the engine or endgame calls for it, else run a
+        fixed-depth search or iterative deepening if a budget is set. A solve
+        that runs out of its share of the budget falls back to iterative
+        deepening for the rest.
+        """
+        empty = board.ROWS * board.COLUMNS - board.total_moves
+        if self.solver is not None and (self.engine == "solver" or empty <= self.endgame_threshold):
+            start = time.perf_counter()
+            try:
+                return self._solve(board, weak=empty > self.endgame_threshold)
+            except SearchAborted:
+                if self._stopped():
+                    raise
+            return self._iterative_deepening(board, start)
+        if self.workers > 1 and self.parallel == "lazy_smp" and self.max_nodes is None:
+            return self._lazy_smp_search(board)
+        if self.time_limit_ms is None and self.max_nodes is None:
+            if self.workers > 1:
+                return self._parallel_search(board)
+            self.last_search_depth = self.depth
+            return self._search_root(board, self.depth)
+        return self._iterative_deepening(board)
+
+    def _search_root(self, board, depth: int) -> Tuple[int, float]:
+        """
+        Run the selected engine from the root with a full window.
+        
+        Returns:
+            Tuple (column, score) with the score from this player's point of view
+        """
+        if self.engine == "pvs":
+            return self._pvs(board, depth, -math.inf, math.inf, self.player_id)
+        if self.engine == "mtdf":
+            col, self.mtdf_guess = self._mtdf(board, depth, self.mtdf_guess)
+            return col, self.mtdf_guess
+        if self.engine == "bitboard":
+            return self._bitboard_minimax(board.to_bitboard(), depth, -math.inf, math.inf, True)
+        return self._minimax(board, depth, -math.inf, math.inf, True)
+
+    def search_root_move(self, board, column: int, depth: int, alpha: float = -math.inf) -> float:
+        """
+        Search a single root move from a cold start, with the root window
+        opened at `alpha` (one root-split task, see ParallelSearch).
+
+        Args:
+            board: The game board object, with this player to move (left unchanged)
+            column: Root move to search
+            depth: Depth of the root search
+            alpha: Score the move has to beat
+
+        Returns:
+            Score of the move from this player's point of view: exact if above
+            alpha, else an upper bound
+
+        Raises:
+            SearchAborted: If stop_event is set during the search
+        """
+        self._reset_search(clear=True)  # a warm table would make results depend on the task order
+        stack_size = len(board.move_stack)
+        if self.stop_event is not None:
+            self._next_check = self.CHECK_INTERVAL
+        try:
+            if self.engine == "bitboard":
+                # converted before the move: a won Board keeps the winner to move
+                pos = board.to_bitboard()
+                pos.play(column)
+                return self._bitboard_minimax(pos, depth - 1, alpha, math.inf, False)[1]
+            board.play(column)
+            if self.engine == "minimax":
+                _, score = self._minimax(board, depth - 1, alpha, math.inf, False)
+            else:
+                _, score = self._pvs(board, depth - 1, -math.inf, -alpha, self.opponent_id)
+                score = -score
+        finally:
+            self._next_check = math.inf
+            while len(board.move_stack) > stack_size:
+                board.undo()
+        return score
+
+    def search_until_stopped(self, board, max_depth: int,
+                             tie_order: Sequence[int] = CENTER_ORDER) -> Tuple[Optional[int], float, int]:
+        """
+        Deepen one ply at a time up to `max_depth`, until stop_event is set,
+        keeping the transposition table as it is (one Lazy SMP worker, see LazySMP).
+
+        Args:
+            board: The game board object, with this player to move (left unchanged)
+            max_depth: Deepest iteration
+            tie_order: Static move order breaking the ties of the move ordering
+
+        Returns:
+            Tuple (column, score, depth) of the last completed iteration;
+            column is None if not even depth 1 completed
+        """
+        self._reset_search(new_search=False)
+        self._center_rank = {c: i for i, c in enumerate(tie_order)}
+        stack_size = len(board.move_stack)
+        col, score, completed = None, 0, 0
+        self._next_check = self.CHECK_INTERVAL
+        try:
+            for depth in range(1, max_depth + 1):
+                col, score = self._search_root(board, depth)
+                completed = depth
+        except SearchAborted:
+            while len(board.move_stack) > stack_size:
+                board.undo()
+        finally:
+            self._next_check = math.inf
+        return col, score, completed
+
+    def search_replies(self, board) -> Dict[int, Tuple[int, float, int]]:
+        """
+        Ponder a position until stop_event is set, keeping the transposition
+        table as it is (the Ponderer worker's search; start_pondering already
+        aged the shared table).
+
+        Args:
+            board: The game board object, with the opponent to move (left unchanged)
+
+        Returns:
+            The best answer to each searched reply, see ponder_results
+        """
+        self._reset_search(new_search=False)
+        self.ponder_results = {}
+        self._ponder(board)
+        return self.ponder_results
+
+    def _solve(self, board, weak: bool = False) -> Tuple[int, int]:
+        """
+        Pick the move with the best exact score (fastest win, else draw, else slowest loss).
+
+        Args:
+            board: The game board object
+            weak: Only tell win, draw and loss apart (any winning move will do)
+
+        Returns:
+            Tuple (column, Solver score) for this player
+
+        Raises:
+            SearchAborted: If SOLVER_BUDGET_SHARE of the time or node budget runs
+                out, or if the search is stopped or cancelled
+        """
+        solver = self.solver
+        solver.nodes = 0
+        nodes_before = self.nodes_evaluated
+        node_limit = None if self.max_nodes is None else self.max_nodes * self.SOLVER_BUDGET_SHARE
+        if self.time_limit_ms is not None:
+            self._deadline = time.perf_counter() + self.time_limit_ms * self.SOLVER_BUDGET_SHARE / 1000
+
+        def check():
+            self.nodes_evaluated = nodes_before + solver.nodes
+            if node_limit is not None and solver.nodes >= node_limit:
+                raise SearchAborted()
+            self._check_budget()
+
+        if (self._deadline is not None or node_limit is not None
+                or self.stop_event is not None or self.cancel_event is not None):
+            solver.check = check
+        try:
+            col, score = solver.best_move(board.to_bitboard(), weak)
+        finally:
+            solver.check = None
+            self._deadline = None
+            self.nodes_evaluated = nodes_before + solver.nodes
+        self.last_search_depth = board.ROWS * board.COLUMNS - board.total_moves
+        self.solved_moves += 1
+        return col, score
+
+    def _parallel_search(self, board) -> Tuple[int, float]:
+        """
+        Fixed-depth search with the root moves split over the worker processes.
+
+        Returns:
+            Tuple (column, score) with the score from this player's point of view
+
+        Raises:
+            SearchAborted: If cancel_event is set during the search
+        """
+        moves = board.get_valid_moves()
+        if self.tactics:
+            moves, line = self._tactical_prepass(board, moves, self.player_id)
+            if line is not None:
+                return moves[0], self._play_line(board, line, self.player_id)
+        if self.move_ordering:
+            moves = self._order_moves(board, moves, None)
+        if self._parallel is None:
+            self._parallel = ParallelSearch(self.workers, self._worker_config(), self.seed)
+        col, score = self._parallel.search(board, self.depth, moves, self.cancel_event)
+        self.worker_nodes = self._parallel.worker_nodes
+        self.nodes_evaluated += sum(self.worker_nodes)
+        if col is None:
+            raise SearchAborted()
+        self.last_search_depth = self.depth
+        return col, score
+
+    def _lazy_smp_search(self, board) -> Tuple[int, float]:
+        """
+        Search with every worker around the shared transposition table, to the
+        fixed depth or until the time limit.
+
+        Returns:
+            Tuple (column, score) with the score from this player's point of view
+
+        Raises:
+            SearchAborted: If cancel_event is set during the search
+        """
+        if self._parallel is None:
+            self._parallel = LazySMP(self.workers, self._worker_config(), self.tt)
+        col, score, self.last_search_depth = self._parallel.search(board, self.depth, self.time_limit_ms,
+                                                                   self.cancel_event)
+        self.worker_nodes = self._parallel.worker_nodes
+        self.nodes_evaluated += sum(self.worker_nodes)
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SearchAborted()
+        if col is None:  # not even depth 1 completed
+            center = board.COLUMNS // 2 + 1
+            col, score = min(board.get_valid_moves(), key=lambda c: abs(c - center)), 0
+        return col, score
+
+    def _worker_config(self) -> dict:
+        """Constructor arguments of the single-process players run by the workers."""
+        return dict(player_id=self.player_id, depth=self.depth, batch_leaves=self.batch_leaves,
+                    tt_size_mb=0 if self.parallel == "lazy_smp" else self.tt_size_mb,
+                    move_ordering=self.move_ordering, engine=self.engine, mtdf_step=self.mtdf_step,
+                    mtdf_bisect=self.mtdf_bisect, tactics=self.tactics, endgame_threshold=0,
+                    eval_weights=self.eval_weights)
+
+    def close(self) -> None:
+        """
+        Stop pondering and the worker processes, if any, and free the shared
+        transposition table. The player cannot search with workers afterwards.
+        Called on exit of a `with AiPlayer(...)` block and when the player is
+        garbage collected; safe to call more than once.
+        """
+        self.stop_pondering()
+        if self._ponderer is not None:
+            self._ponderer.close()
+            self._ponderer = None
+        if self._parallel is not None:
+            self._parallel.close()
+            self._parallel = None
+        if isinstance(self.tt, SharedTranspositionTable):
+            self.tt.close()
+            self.tt = None
+
+    def __enter__(self) -> "AiPlayer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self):
+        if "_ponderer" in self.__dict__:  # not when __init__ failed early
+            self.close()
+
+    def _reset_search(self, clear: bool = False, new_search: bool = True) -> None:
+        """
+        Reset the counters before a new search. The cache and ordering tables
+        are kept from the previous moves of the game, only aged.
+
+        Args:
+            clear: Empty the cache, killers and history instead (cold start)
+            new_search: Age the cache and halve the history scores
+        """
+        self.nodes_evaluated = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        if clear:
+            if self.tt is not None:
+                self.tt.clear()
+            for killers in self.killers:
+                killers[0] = killers[1] = 0
+            for history in self.history:
+                history[:] = [0] * len(history)
+        elif new_search:
+            if self.tt is not None:
+                self.tt.new_search()
+            for history in self.history:
+                history[:] = [h // 2 for h in history]
+
+    def new_game(self) -> None:
+        """Forget everything learned from the previous game (called by Board.reset_game)."""
+        self.stop_pondering()
+        self.ponder_results = {}
+        self._reset_search(clear=True)
+        self.mtdf_guess = 0
+        self.pv = []
+        self._pv_moves = {}
+
+    def _update_pv(self, board) -> None:
+        """
+        Read the principal variation of the last search from the transposition
+        table and remember its moves for ordering the next searches.
+        """
+        self.pv = []
+        self._pv_moves = {}
+        if self.tt is None:
+            return
+        for _ in range(max(1, self.last_search_depth)):
+            if board.game_over:
+                break
+            tt_move, _ = self._probe_tt(board, 0, board.get_valid_moves())
+            if tt_move is None:
+                break
+            self._pv_moves[board.zobrist_key] = tt_move
+            self.pv.append(tt_move)
+            board.play(tt_move)
+        for _ in self.pv:
+            board.undo()
+
+    def _iterative_deepening(self, board, start: Optional[float] = None) -> Tuple[int, float]:
+        """
+        Search depth 1, 2, 3, ... until the time or node budget runs out.
+        
+        Args:
+            board: The game board object
+            start: perf_counter() time the time budget started at (default: now)
+            
+        Returns:
+            Tuple (column, score) found by the last completed depth
+        """
+        if self.time_limit_ms is not None:
+            self._deadline = (start if start is not None else time.perf_counter()) + self.time_limit_ms / 1000
+        self._next_check = min(self.CHECK_INTERVAL, self.max_nodes or math.inf)
+        stack_size = len(board.move_stack)
+        center = board.COLUMNS // 2 + 1
+        best_col = min(board.get_valid_moves(), key=lambda c: abs(c - center))  # if depth 1 aborts
+        best_score = 0
+        self.last_search_depth = 0
+        try:
+            for depth in range(1, board.ROWS * board.COLUMNS - board.total_moves + 1):
+                best_col, best_score = self._search_root(board, depth)
+                self.last_search_depth = depth
+        except SearchAborted:
+            # unwind the moves left on the board by the interrupted search
+            while len(board.move_stack) > stack_size:
+                board.undo()
+        finally:
+            self._deadline = None
+            self._next_check = math.inf
+        return best_col, best_score
+
+    def _stopped(self) -> bool:
+        """Check if the search was stopped (pondering, Lazy SMP) or cancelled (GUI) rather than out of budget."""
+        return ((self.stop_event is not None and self.stop_event.is_set())
+                or (self.cancel_event is not None and self.cancel_event.is_set()))
+
+    def _check_budget(self) -> None:
+        """Abort the search if its node or time budget is spent, or if it is stopped or cancelled."""
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchAborted()
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SearchAborted()
+        if self.max_nodes is not None and self.nodes_evaluated >= self.max_nodes:
+            raise SearchAborted()
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchAborted()
+        self._next_check = self.nodes_evaluated + self.CHECK_INTERVAL
+        if self.max_nodes is not None:
+            self._next_check = min(self._next_check, self.max_nodes)
+
     def _minimax(self, board, depth: int, alpha: float, beta: float, maximizing: bool) -> Tuple[int, float]:
         """
         Minimax algorithm with alpha-beta pruning.
+        Moves are played and undone in place on `board`, which is left unchanged.
 
         Args:
-            board: The game board object
+            board: The game board object, with this player to move at the root
             depth: Current depth in the search tree
             alpha: Alpha value for pruning
             beta: Beta value for pruning
@@ -65,22 +631,416 @@ class AiPlayer:
         """
         # Increment node counter for each call to minimax
         self.nodes_evaluated += 1
+        if self.nodes_evaluated >= self._next_check:
+            self._check_budget()
         
         # terminal / horizon
         if depth == 0 or board.game_over:
-            return None, board.relative_score(self.player_id)
+            return None, self._evaluate(board, self.player_id)
 
         valid_moves = board.get_valid_moves()
         if not valid_moves:  # safety net (should be caught by game_over)
-            return None, board.relative_score(self.player_id)
+            return None, self._evaluate(board, self.player_id)
+
+        if self.tactics:
+            valid_moves, line = self._tactical_prepass(board, valid_moves, board.get_current_player().player_id)
+            if line is not None:
+                return valid_moves[0], self._play_line(board, line, self.player_id)
+
+        # transposition table: cutoff on a deep enough entry, else try its move first
+        tt = self.tt
+        tt_move = None
+        if tt is not None:
+            tt_move, bound = self._probe_tt(board, depth, valid_moves)
+            if bound is not None:
+                flag, score = bound
+                if not maximizing:  # stored for the side to move
+                    flag, score = tt.NEGATED_FLAG[flag], -score
+                if flag == tt.EXACT:
+                    return tt_move, score
+                if flag == tt.LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return tt_move, score
+            alpha_orig, beta_orig = alpha, beta
+
+        if self.move_ordering:
+            valid_moves = self._order_moves(board, valid_moves, tt_move)
+        elif tt_move is not None:
+            valid_moves.remove(tt_move)
+            valid_moves.insert(0, tt_move)
+
+        if depth == 1 and self.batch_leaves:
+            best_col, value = self._batched_horizon(board, valid_moves, maximizing)
+        else:
+            best_col, value = self._minimax_children(board, valid_moves, depth, alpha, beta, maximizing)
+
+        if tt is not None:
+            if maximizing:
+                self._store_tt(board, depth, value, alpha_orig, beta_orig, best_col)
+            else:
+                self._store_tt(board, depth, -value, -beta_orig, -alpha_orig, best_col)
+        return best_col, value
+
+    def _probe_tt(self, board, depth: int, valid_moves) -> Tuple[Optional[int], Optional[Tuple[int, int]]]:
+        """
+        Look up the position in the transposition table.
+
+        Args:
+            board: The game board object
+            depth: Remaining depth of the node
+            valid_moves: Valid columns at this node
+
+        Returns:
+            Tuple (move, bound): the stored best move if it is valid here, and
+            (flag, score) for the side to move if the entry is deep enough to use
+        """
+        key, mirrored = board.canonical_key()
+        entry = self.tt.probe(key)
+        if entry is None:
+            return None, None
+        tt_depth, flag, score, tt_move = entry
+        if mirrored:
+            tt_move = board.mirror_column(tt_move)
+        if tt_move not in valid_moves:  # key collision
+            return None, None
+        return tt_move, ((flag, score) if tt_depth >= depth else None)
+
+    def _store_tt(self, board, depth: int, value: float, alpha: float, beta: float, best_col: int) -> None:
+        """
+        Store a search result for the side to move.
+
+        Args:
+            board: The game board object
+            depth: Remaining depth of the node
+            value: Fail-soft result, for the side to move
+            alpha: Lower bound of the window the node was searched with
+            beta: Upper bound of the window the node was searched with
+            best_col: Best move found
+        """
+        tt = self.tt
+        if value <= alpha:
+            flag = tt.UPPER
+        elif value >= beta:
+            flag = tt.LOWER
+        else:
+            flag = tt.EXACT
+        key, mirrored = board.canonical_key()
+        tt.store(key, depth, flag, value, board.mirror_column(best_col) if mirrored else best_col)
+
+    def _minimax_children(self, board, valid_moves, depth: int, alpha: float, beta: float,
+                          maximizing: bool) -> Tuple[int, float]:
+        """
+        Search the children of a _minimax node in the given order.
 
+        Returns:
+            Tuple (column, score) for the best move
+        """
+        best_col = random.choice(valid_moves)  # fallback if all equal
+
+        if maximizing:
+            value = -math.inf
+            for i, c in enumerate(valid_moves):
+                board.play(c)
+                _, score = self._minimax(board, depth - 1, alpha, beta, False)
+                board.undo()
+                if score > value:
+                    value, best_col = score, c
+                alpha = max(alpha, value)
+                if beta <= alpha:
+                    self._record_cutoff(board, c, i, depth)
+                    break  # β‑cutoff
+            return best_col, value
+        else:  # minimizing (opponent)
+            value = math.inf
+            for i, c in enumerate(valid_moves):
+                board.play(c)
+                _, score = self._minimax(board, depth - 1, alpha, beta, True)
+                board.undo()
+                if score < value:
+                    value, best_col = score, c
+                beta = min(beta, value)
+                if beta <= alpha:
+                    self._record_cutoff(board, c, i, depth)
+                    break  # α‑cutoff
+            return best_col, value
+
+    def _pvs(self, board, depth: int, alpha: float, beta: float, pid: int) -> Tuple[int, float]:
+        """
+        Principal variation search in negamax form.
+        The first move is searched with the full window and the others with
+        a null window, re-searching only the moves that fail high.
+
+        Args:
+            board: The game board object, with player `pid` to move
+            depth: Current depth in the search tree
+            alpha: Alpha value for pruning, for the side to move
+            beta: Beta value for pruning, for the side to move
+            pid: ID of the player to move
+
+        Returns:
+            Tuple (column, score) for the best move, score from `pid`'s point of view
+        """
+        self.nodes_evaluated += 1
+        if self.nodes_evaluated >= self._next_check:
+            self._check_budget()
+
+        # terminal / horizon
+        if depth == 0 or board.game_over:
+            return None, self._evaluate(board, pid)
+
+        valid_moves = board.get_valid_moves()
+        if self.tactics:
+            valid_moves, line = self._tactical_prepass(board, valid_moves, pid)
+            if line is not None:
+                return valid_moves[0], self._play_line(board, line, pid)
+
+        tt = self.tt
+        tt_move = None
+        if tt is not None:
+            tt_move, bound = self._probe_tt(board, depth, valid_moves)
+            if bound is not None:
+                flag, score = bound
+                if flag == tt.EXACT:
+                    return tt_move, score
+                if flag == tt.LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return tt_move, score
+        alpha_orig, beta_orig = alpha, beta
+
+        if self.move_ordering:
+            valid_moves = self._order_moves(board, valid_moves, tt_move)
+        elif tt_move is not None:
+            valid_moves.remove(tt_move)
+            valid_moves.insert(0, tt_move)
+
+        opp = 3 - pid
+        best_col, value = valid_moves[0], -math.inf
+        for i, c in enumerate(valid_moves):
+            board.play(c)
+            if i == 0:
+                score = -self._pvs(board, depth - 1, -beta, -alpha, opp)[1]
+            else:
+                # scout with a null window, re-search if it might beat alpha
+                score = -self._pvs(board, depth - 1, -alpha - 1, -alpha, opp)[1]
+                if alpha < score < beta:
+                    score = -self._pvs(board, depth - 1, -beta, -alpha, opp)[1]
+            board.undo()
+            if score > value:
+                value, best_col = score, c
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                self._record_cutoff(board, c, i, depth)
+                break
+
+        if tt is not None:
+            self._store_tt(board, depth, value, alpha_orig, beta_orig, best_col)
+        return best_col, value
+
+    def _mtdf(self, board, depth: int, guess: float) -> Tuple[int, float]:
+        """
+        MTD(f): converge on the minimax value with zero-window searches.
+        Relies on the transposition table to make the repeated passes cheap.
+
+        Args:
+            board: The game board object, with this player to move
+            depth: Search depth
+            guess: First guess of the value, usually the previous iteration's
+
+        Returns:
+            Tuple (column, score) for the best move
+        """
+        lower, upper = -math.inf, math.inf
+        g = guess
+        step = self.mtdf_step
+        last_high = None
+        best_col = col = None
+        self.mtdf_passes = 0
+        while lower < upper:
+            if self.mtdf_bisect and lower > -math.inf and upper < math.inf:
+                beta = (lower + upper + 1) // 2
+            elif g == lower:
+                beta = min(g + step, upper)
+            else:
+                beta = max(g - step + 1, lower + 1)
+            col, g = self._pvs(board, depth, beta - 1, beta, self.player_id)
+            self.mtdf_passes += 1
+            high = g >= beta
+            if high:
+                lower = g
+                best_col = col  # a fail high proves its move reaches the bound
+            else:
+                upper = g
+            if last_high is not None and high != last_high:
+                step = max(1, step // 2)  # overshot: refine
+            last_high = high
+        return (best_col if best_col is not None else col), g
+
+    def _tactical_prepass(self, board, valid_moves: List[int], pid: int) -> Tuple[List[int], Optional[List[int]]]:
+        """
+        Resolve the forced cases of a node before branching.
+
+        Args:
+            board: The game board object
+            valid_moves: Valid columns at this node
+            pid: ID of the player to move
+
+        Returns:
+            Tuple (moves, line). `moves` are the columns left to search: the
+            winning move, the single forced block, or the moves that do not let
+            the opponent win right on top of them. `line` is set when the result
+            is already known: the immediate win, or a block followed by the
+            opponent's other winning move when there are two threats.
+        """
+        opp = 3 - pid
+        threats = []
+        for c in valid_moves:
+            if board.is_winning_move(c, pid):
+                return [c], [c]
+            if board.is_winning_move(c, opp):
+                threats.append(c)
+        if len(threats) > 1:
+            return threats[:1], threats[:2]  # cannot block both: lost
+        if threats:
+            return threats, None
+        safe = [c for c in valid_moves if not board.gives_win_above(c, opp)]
+        return (safe or valid_moves), None
+
+    def _evaluate(self, board, pid: int) -> int:
+        """Static evaluation for player `pid`, with this player's weights if it has its own."""
+        if self.eval_weights is None:
+            return board.relative_score(pid)
+        if self._eval_tables is None:
+            self._eval_tables = board.evaluation_tables(*self.eval_weights)
+        return board.vectorized_relative_score(pid, self._eval_tables)
+
+    def _play_line(self, board, line: List[int], pid: int) -> int:
+        """Evaluate the position at the end of a forced line, for player `pid`."""
+        for c in line:
+            board.play(c)
+        score = self._evaluate(board, pid)
+        for _ in line:
+            board.undo()
+        return score
+
+    def _order_moves(self, board, valid_moves, tt_move: Optional[int]):
+        """
+        Sort moves for the side to move: the hash move, the previous
+        principal variation's move, immediate wins, forced blocks, this ply's
+        killer moves, then by history score with the center-out order
+        breaking ties.
+
+        Args:
+            board: The game board object
+            valid_moves: Valid columns at this node
+            tt_move: Best move stored in the transposition table, if any
+
+        Returns:
+            The moves in search order
+        """
+        pid = board.get_current_player().player_id
+        killers = self.killers[board.total_moves]
+        history = self.history[pid]
+        center_rank = self._center_rank
+        check_tactics = not self.tactics  # else the pre-pass already handled wins and blocks
+
+        pv_move = self._pv_moves.get(board.zobrist_key)
+
+        def rank(c):
+            if c == tt_move:
+                tier = 0
+            elif c == pv_move:
+                tier = 1
+            elif check_tactics and board.is_winning_move(c, pid):
+                tier = 2
+            elif check_tactics and board.is_winning_move(c, 3 - pid):
+                tier = 3
+            elif c == killers[0] or c == killers[1]:
+                tier = 4
+            else:
+                tier = 5
+            return tier, -history[c], center_rank[c]
+
+        return sorted(valid_moves, key=rank)
+
+    def _record_cutoff(self, board, column: int, index: int, depth: int) -> None:
+        """Update killers, history and pruning statistics after a cutoff by `column`."""
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        killers = self.killers[board.total_moves]
+        if killers[0] != column:
+            killers[1] = killers[0]
+            killers[0] = column
+        self.history[board.get_current_player().player_id][column] += depth * depth
+
+    def get_ordering_efficiency(self):
+        """
+        Get the share of cutoffs produced by the first move searched in the last search.
+        Close to 1.0 means the move ordering is close to the best case.
+        
+        Returns:
+            Fraction between 0 and 1 (0.0 if there was no cutoff)
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def _batched_horizon(self, board, valid_moves, maximizing: bool) -> Tuple[int, float]:
+        """
+        Depth-1 search that scores all children with a single batched evaluation.
+
+        Args:
+            board: The game board object
+            valid_moves: Valid columns at this node
+            maximizing: Boolean, True if this player is to move
+
+        Returns:
+            Tuple (column, score) for the best move
+        """
+        self.nodes_evaluated += len(valid_moves)  # children count as visited leaves
+        if self.eval_weights is not None and self._eval_tables is None:
+            self._eval_tables = board.evaluation_tables(*self.eval_weights)
+        scores = board.batch_relative_score(valid_moves, self.player_id, self._eval_tables)
+        best = int(scores.argmax() if maximizing else scores.argmin())  # first best, as in _minimax
+        return valid_moves[best], int(scores[best])
+
+    def _bitboard_minimax(self, pos, depth: int, alpha: float, beta: float, maximizing: bool) -> Tuple[int, float]:
+        """
+        Minimax with alpha-beta pruning on a BitBoard.
+        Same search and scores as _minimax without the transposition table,
+        tactical pre-pass and move ordering, and without any NumPy access.
+
+        Args:
+            pos: BitBoard of the position, with the side to move matching `maximizing`
+            depth: Current depth in the search tree
+            alpha: Alpha value for pruning
+            beta: Beta value for pruning
+            maximizing: Boolean, True if this player is to move
+
+        Returns:
+            Tuple (column, score) for the best move
+        """
+        self.nodes_evaluated += 1
+        if self.nodes_evaluated >= self._next_check:
+            self._check_budget()
+
+        # terminal / horizon
+        if depth == 0 or pos.last_player_won() or pos.is_full():
+            return None, pos.relative_score(maximizing, self.eval_weights)
+
+        valid_moves = pos.valid_moves()
         best_col = random.choice(valid_moves)  # fallback if all equal
 
         if maximizing:
             value = -math.inf
             for c in valid_moves:
-                child = board.apply_move(self.player_id, c)
-                _, score = self._minimax(child, depth - 1, alpha, beta, False)
+                child = pos.copy()
+                child.play(c)
+                _, score = self._bitboard_minimax(child, depth - 1, alpha, beta, False)
                 if score > value:
                     value, best_col = score, c
                 alpha = max(alpha, value)
@@ -90,8 +1050,9 @@ class AiPlayer:
         else:  # minimizing (opponent)
             value = math.inf
             for c in valid_moves:
-                child = board.apply_move(self.opponent_id, c)
-                _, score = self._minimax(child, depth - 1, alpha, beta, True)
+                child = pos.copy()
+                child.play(c)
+                _, score = self._bitboard_minimax(child, depth - 1, alpha, beta, True)
                 if score < value:
                     value, best_col = score, c
                 beta = min(beta, value)
@@ -104,9 +1065,10 @@ class AiPlayer:
         """
         Standard Minimax algorithm without alpha-beta pruning.
         Used for performance comparison.
+        Moves are played and undone in place on `board`, which is left unchanged.
         
         Args:
-            board: The game board object
+            board: The game board object, with this player to move at the root
             depth: Current depth in the search tree
             maximizing_player: Boolean, True if current player is maximizing
             
@@ -129,16 +1091,18 @@ class AiPlayer:
         if maximizing:
             value = -math.inf
             for c in valid_moves:
-                child = board.apply_move(self.player_id, c)
-                _, score = self._standard_minimax(child, depth - 1, False)
+                board.play(c)
+                _, score = self._standard_minimax(board, depth - 1, False)
+                board.undo()
                 if score > value:
                     value, best_col = score, c
             return best_col, value
         else:  # minimizing (opponent)
             value = math.inf
             for c in valid_moves:
-                child = board.apply_move(self.opponent_id, c)
-                _, score = self._standard_minimax(child, depth - 1, True)
+                board.play(c)
+                _, score = self._standard_minimax(board, depth - 1, True)
+                board.undo()
                 if score < value:
                     value, best_col = score, c
             return best_col, value
@@ -169,10 +1133,70 @@ class AiPlayer:
         Returns:
             Column number for the next move and nodes evaluated
         """
-        self.nodes_evaluated = 0  # Reset counter
+        self._reset_search(clear=True)
         col, _ = self._minimax(board, self.depth, -math.inf, math.inf, True)
         return col, self.nodes_evaluated
 
+    def get_move_with_bitboard(self, board):
+        """
+        Get move using minimax with alpha-beta pruning on a BitBoard.
+        Used for performance comparison.
+
+        Args:
+            board: The game board object
+
+        Returns:
+            Column number for the next move and nodes evaluated
+        """
+        self.nodes_evaluated = 0  # Reset counter
+        col, _ = self._bitboard_minimax(board.to_bitboard(), self.depth, -math.inf, math.inf, True)
+        return col, self.nodes_evaluated
+
+    def get_move_with_pvs(self, board):
+        """
+        Get move using principal variation search.
+        Used for performance comparison.
+
+        Args:
+            board: The game board object
+
+        Returns:
+            Column number for the next move and nodes evaluated
+        """
+        self._reset_search(clear=True)
+        col, _ = self._pvs(board, self.depth, -math.inf, math.inf, self.player_id)
+        return col, self.nodes_evaluated
+
+    def get_move_with_search(self, board):
+        """
+        Get move using the configured search (engine, workers, budget) from a cold start.
+        Used for performance comparison.
+
+        Args:
+            board: The game board object
+
+        Returns:
+            Column number for the next move and nodes evaluated (by all workers)
+        """
+        self._reset_search(clear=True)
+        col, _ = self._search(board)
+        return col, self.nodes_evaluated
+
+    def get_move_with_mtdf(self, board):
+        """
+        Get move using MTD(f), seeded with the previous search's value.
+        Used for performance comparison.
+
+        Args:
+            board: The game board object
+
+        Returns:
+            Column number for the next move and nodes evaluated
+        """
+        self._reset_search(clear=True)
+        col, self.mtdf_guess = self._mtdf(board, self.depth, self.mtdf_guess)
+        return col, self.nodes_evaluated
+
     def get_average_move_time(self):
         """
         Get the average time taken per move.
@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+ROWS = 6
+COLUMNS = 7
+HEIGHT = ROWS + 1  # one sentinel bit on top of every column
+
+# Bit ``col * HEIGHT + h`` is the cell of column ``col`` at height ``h``
+# (0 = bottom row).  The sentinel row keeps shifts from wrapping a line
+# of four around into the next column.
+BOTTOM_MASK = sum(1 << (c * HEIGHT) for c in range(COLUMNS))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+
+# Score of a four-cell window by the number of own stones in it, as long
+# as no opponent stone is in the window (same weights as Board._eval_window).
+_WINDOW_WEIGHTS = (0, 0, 10, 100, 100_000)
+
+# For each direction of a window (vertical, horizontal and both diagonals):
+# the bit distance between two neighbouring cells, and the bits where a
+# window of four cells in that direction starts without leaving the board
+_WINDOW_STARTS = tuple(
+    (d, BOARD_MASK & (BOARD_MASK >> d) & (BOARD_MASK >> (2 * d)) & (BOARD_MASK >> (3 * d)))
+    for d in (1, HEIGHT, HEIGHT - 1, HEIGHT + 1)
+)
+
+
+def _cell_bit(row: int, index: int) -> int:
+    """Bit of the `game_state[row, index]` cell (row 0 is the top row)."""
+    return 1 << (index * HEIGHT + (ROWS - 1 - row))
+
+
+CENTER_MASK = ((1 << ROWS) - 1) << (3 * HEIGHT)
+SIDE_CENTER_MASK = (((1 << ROWS) - 1) << (2 * HEIGHT)) | (((1 << ROWS) - 1) << (4 * HEIGHT))
+
+
+def _popcount(x: int) -> int:
+    return bin(x).count("1")
+
+
+if hasattr(int, "bit_count"):  # Python 3.10+
+    _popcount = int.bit_count  # noqa: F811
+
+
+def column_mask(column: int) -> int:
+    """All playable cells of a column (1-7)."""
+    return ((1 << ROWS) - 1) << ((column - 1) * HEIGHT)
+
+
+def top_mask(column: int) -> int:
+    """Top playable cell of a column (1-7)."""
+    return 1 << (ROWS - 1 + (column - 1) * HEIGHT)
+
+
+def bottom_mask(column: int) -> int:
+    """Bottom cell of a column (1-7)."""
+    return 1 << ((column - 1) * HEIGHT)
+
+
+_TOP_MASKS = tuple((c, top_mask(c)) for c in range(1, COLUMNS + 1))
+
+
+def alignment(stones: int) -> bool:
+    """Check whether a set of stones contains four in a row."""
+    # horizontal
+    m = stones & (stones >> HEIGHT)
+    if m & (m >> (2 * HEIGHT)):
+        return True
+    # diagonal /
+    m = stones & (stones >> (HEIGHT + 1))
+    if m & (m >> (2 * (HEIGHT + 1))):
+        return True
+    # diagonal \
+    m = stones & (stones >> (HEIGHT - 1))
+    if m & (m >> (2 * (HEIGHT - 1))):
+        return True
+    # vertical
+    m = stones & (stones >> 1)
+    if m & (m >> 2):
+        return True
+    return False
+
+
+def winning_positions(stones: int, mask: int) -> int:
+    """
+    Empty cells (reachable or not) where one more stone would give `stones` four in a row.
+
+    Args:
+        stones: Stones of one player
+        mask: All occupied cells
+    """
+    # vertical: three stones right below
+    r = (stones << 1) & (stones << 2) & (stones << 3)
+    for shift in (HEIGHT, HEIGHT - 1, HEIGHT + 1):  # horizontal and both diagonals
+        p = (stones << shift) & (stones << (2 * shift))
+        r |= p & (stones << (3 * shift))
+        r |= p & (stones >> shift)
+        p = (stones >> shift) & (stones >> (2 * shift))
+        r |= p & (stones << shift)
+        r |= p & (stones >> (3 * shift))
+    return r & (BOARD_MASK ^ mask)
+
+
+def mirror(bits: int) -> int:
+    """Mirror a bitboard (or position key) about the center column."""
+    column = (1 << HEIGHT) - 1
+    result = 0
+    for c in range(COLUMNS):
+        result |= ((bits >> (c * HEIGHT)) & column) << ((COLUMNS - 1 - c) * HEIGHT)
+    return result
+
+
+class BitBoard:
+    """
+    Compact Connect Four position built on two integer bitmasks.
+
+    `current` holds the stones of the player to move and `mask` every
+    occupied cell, so the opponent's stones are `current ^ mask`. Playing a
+    move is a single addition, and win checks and evaluation are a handful
+    of shifts and ANDs instead of per-cell NumPy indexing.
+    """
+
+    __slots__ = ("current", "mask", "moves")
+
+    def __init__(self, current: int = 0, mask: int = 0, moves: int = 0):
+        """
+        Create a position from raw bitmasks.
+
+        Args:
+            current: Stones of the player to move
+            mask: All occupied cells
+            moves: Number of stones on the board
+        """
+        self.current = current
+        self.mask = mask
+        self.moves = moves
+
+    @classmethod
+    def from_game_state(cls, game_state: np.ndarray, player_id: int) -> "BitBoard":
+        """
+        Build a position from a Board.game_state array.
+
+        Args:
+            game_state: (ROWS, COLUMNS) array of player ids, row 0 on top
+            player_id: ID of the player to move (1 or 2)
+
+        Returns:
+            The equivalent BitBoard
+        """
+        current = mask = moves = 0
+        for row in range(ROWS):
+            for index in range(COLUMNS):
+                cell = game_state[row, index]
+                if cell:
+                    bit = _cell_bit(row, index)
+                    mask |= bit
+                    moves += 1
+                    if cell == player_id:
+                        current |= bit
+        return cls(current, mask, moves)
+
+    def to_game_state(self, player_id: int) -> np.ndarray:
+        """
+        Convert the position back into a Board.game_state array.
+
+        Args:
+            player_id: ID of the player to move (1 or 2)
+
+        Returns:
+            (ROWS, COLUMNS) np.int8 array of player ids
+        """
+        state = np.zeros((ROWS, COLUMNS), np.int8)
+        for row in range(ROWS):
+            for index in range(COLUMNS):
+                bit = _cell_bit(row, index)
+                if self.mask & bit:
+                    state[row, index] = player_id if self.current & bit else 3 - player_id
+        return state
+
+    def copy(self) -> "BitBoard":
+        return BitBoard(self.current, self.mask, self.moves)
+
+    def key(self) -> int:
+        """Unique key of the position (stones to move plus a bit on top of each column)."""
+        return self.current + self.mask
+
+    def canonical_key(self) -> Tuple[int, bool]:
+        """
+        Key shared by the position and its mirror image.
+
+        Returns:
+            Tuple (key, mirrored); when mirrored is True, moves stored under
+            the key are mirrored (column -> COLUMNS + 1 - column)
+        """
+        key = self.current + self.mask
+        mirrored_key = mirror(key)
+        if mirrored_key < key:
+            return mirrored_key, True
+        return key, False
+
+    def can_play(self, column: int) -> bool:
+        """Check if a column (1-7) still has room."""
+        return (self.mask & top_mask(column)) == 0
+
+    def valid_moves(self) -> List[int]:
+        """Get all playable columns (1-7)."""
+        mask = self.mask
+        return [c for c, top in _TOP_MASKS if not mask & top]
+
+    def possible(self) -> int:
+        """Mask of the cells where a stone can be dropped."""
+        return (self.mask + BOTTOM_MASK) & BOARD_MASK
+
+    def play(self, column: int) -> None:
+        """Drop a stone of the player to move in a column (1-7) and switch sides."""
+        self.current ^= self.mask
+        self.mask |= self.mask + (1 << ((column - 1) * HEIGHT))
+        self.moves += 1
+
+    def play_move(self, move: int) -> None:
+        """Play a move given as the bit of its landing cell (from possible())."""
+        self.current ^= self.mask
+        self.mask |= move
+        self.moves += 1
+
+    def winning_moves(self) -> int:
+        """Mask of the playable cells where the player to move wins at once."""
+        return winning_positions(self.current, self.mask) & self.possible()
+
+    def possible_non_losing_moves(self) -> int:
+        """
+        Mask of the moves that do not lose at once, assuming no immediate win:
+        the single forced block if the opponent has one threat, none if it has
+        two, and never a cell right below an opponent winning cell.
+        """
+        possible = self.possible()
+        opponent_win = winning_positions(self.current ^ self.mask, self.mask)
+        forced = possible & opponent_win
+        if forced:
+            if forced & (forced - 1):
+                return 0  # two threats: cannot block both
+            possible = forced
+        return possible & ~(opponent_win >> 1)
+
+    def move_score(self, move: int) -> int:
+        """Number of winning cells the player to move would have after `move` (for ordering)."""
+        return _popcount(winning_positions(self.current | move, self.mask))
+
+    def is_winning_move(self, column: int) -> bool:
+        """Check if the player to move wins by playing in a column (1-7)."""
+        stones = self.current | ((self.mask + bottom_mask(column)) & column_mask(column))
+        return alignment(stones)
+
+    def last_player_won(self) -> bool:
+        """Check if the player who just moved has four in a row."""
+        return alignment(self.current ^ self.mask)
+
+    def is_full(self) -> bool:
+        return self.moves == ROWS * COLUMNS
+
+    @staticmethod
+    def pos_score(stones: int, opponent: int) -> int:
+        """
+        Heuristic score of `stones`, identical to Board.pos_score.
+
+        Args:
+            stones: Stones of the player to score
+            opponent: Stones of the other player
+
+        Returns:
+            Center control plus the weights of all open windows
+        """
+        score = 3 * _popcount(stones & CENTER_MASK) + 2 * _popcount(stones & SIDE_CENTER_MASK)
+        twos = threes = fours = 0
+        for d, on_board in _WINDOW_STARTS:
+            s1, s2, s3 = stones >> d, stones >> (2 * d), stones >> (3 * d)
+            # windows starting at each bit that fit on the board and hold no opponent stone
+            open_ = on_board & ~(opponent | (opponent >> d) | (opponent >> (2 * d)) | (opponent >> (3 * d)))
+            # bit-sliced sum of the four cells: units and twos digits of every window
+            ab, ce = stones ^ s1, s2 ^ s3
+            units = ab ^ ce
+            pairs = ((stones & s1) ^ (s2 & s3) ^ (ab & ce)) & open_
+            twos += _popcount(pairs & ~units)
+            threes += _popcount(pairs & units)
+            fours += _popcount(stones & s1 & s2 & s3)
+        return (score + _WINDOW_WEIGHTS[2] * twos + _WINDOW_WEIGHTS[3] * threes
+                + _WINDOW_WEIGHTS[4] * fours)
+
+    @staticmethod
+    def weighted_score(stones: int, opponent: int, window_weights: Sequence[int],
+                       center_weights: Sequence[int]) -> int:
+        """
+        Heuristic score of `stones` with other weights than pos_score.
+
+        Args:
+            stones: Stones of the player to score
+            opponent: Stones of the other player
+            window_weights: Score of a window without opponent stones by its number
+                of own stones (5 values)
+            center_weights: Score of a stone by its column (COLUMNS values)
+
+        Returns:
+            Weighted column counts plus the weights of all open windows
+        """
+        score = sum(w * _popcount(stones & column_mask(c)) for c, w in enumerate(center_weights, 1) if w)
+        counts = [0] * 5
+        for d, on_board in _WINDOW_STARTS:
+            s1, s2, s3 = stones >> d, stones >> (2 * d), stones >> (3 * d)
+            open_ = on_board & ~(opponent | (opponent >> d) | (opponent >> (2 * d)) | (opponent >> (3 * d)))
+            ab, ce = stones ^ s1, s2 ^ s3
+            units = (ab ^ ce) & open_
+            pairs = ((stones & s1) ^ (s2 & s3) ^ (ab & ce)) & open_
+            fours = stones & s1 & s2 & s3
+            counts[0] += _popcount(open_ & ~(units | pairs | fours))
+            counts[1] += _popcount(units & ~pairs)
+            counts[2] += _popcount(pairs & ~units)
+            counts[3] += _popcount(pairs & units)
+            counts[4] += _popcount(fours)
+        return score + sum(w * n for w, n in zip(window_weights, counts))
+
+    def relative_score(self, to_move: bool = True,
+                       weights: Optional[Tuple[Sequence[int], Sequence[int]]] = None) -> int:
+        """
+        Same as Board.relative_score, for the player to move or the one who just moved.
+        Computes pos_score(mine, theirs) - pos_score(theirs, mine) in one pass,
+        sharing the shifted stone masks of both players.
+
+        Args:
+            to_move: Score for the player to move if True, else for the other player
+            weights: Other evaluation weights (window weights, center weights), as
+                in Board.evaluation_tables: same value as Board.vectorized_relative_score
+        """
+        mine = self.current
+        theirs = self.current ^ self.mask
+        if not to_move:
+            mine, theirs = theirs, mine
+        if weights is not None:
+            return self.weighted_score(mine, theirs, *weights) - self.weighted_score(theirs, mine, *weights)
+        score = (3 * (_popcount(mine & CENTER_MASK) - _popcount(theirs & CENTER_MASK))
+                 + 2 * (_popcount(mine & SIDE_CENTER_MASK) - _popcount(theirs & SIDE_CENTER_MASK)))
+        twos = threes = fours = 0
+        for d, on_board in _WINDOW_STARTS:
+            m1, m2, m3 = mine >> d, mine >> (2 * d), mine >> (3 * d)
+            t1, t2, t3 = theirs >> d, theirs >> (2 * d), theirs >> (3 * d)
+            ab, ce = mine ^ m1, m2 ^ m3
+            units = ab ^ ce
+            pairs = ((mine & m1) ^ (m2 & m3) ^ (ab & ce)) & on_board & ~(theirs | t1 | t2 | t3)
+            twos += _popcount(pairs & ~units)
+            threes += _popcount(pairs & units)
+            fours += _popcount(mine & m1 & m2 & m3)
+            ab, ce = theirs ^ t1, t2 ^ t3
+            units = ab ^ ce
+            pairs = ((theirs & t1) ^ (t2 & t3) ^ (ab & ce)) & on_board & ~(mine | m1 | m2 | m3)
+            twos -= _popcount(pairs & ~units)
+            threes -= _popcount(pairs & units)
+            fours -= _popcount(theirs & t1 & t2 & t3)
+        return (score + _WINDOW_WEIGHTS[2] * twos + _WINDOW_WEIGHTS[3] * threes
+                + _WINDOW_WEIGHTS[4] * fours)
+
+    def __str__(self):
+        return "\n".join(
+            " ".join(
+                "0" if not self.mask & _cell_bit(r, c) else ("X" if self.current & _cell_bit(r, c) else "O")
+                for c in range(COLUMNS)
+            )
+            for r in range(ROWS)
+        )
@@ -2,10 +2,66 @@ from __future__ import annotations
 
 from game.HumanPlayer import HumanPlayer
 from game.AiPlayer import AiPlayer
+from game.BitBoard import BitBoard
 import numpy as np
-from typing import List, Optional, Union
+import random
+from typing import List, Optional, Sequence, Tuple, Union
 
 PlayerT = Union[HumanPlayer, AiPlayer]
+
+
+def _moves_by_mask(columns: int) -> List[List[int]]:
+    """Playable columns (1-based) for every valid-move bitmask."""
+    return [[c + 1 for c in range(columns) if mask >> c & 1] for mask in range(1 << columns)]
+
+
+def _windows(rows: int, columns: int) -> List[List[Tuple[int, int]]]:
+    """Cells (row, index) of every four-cell window, in scan_pos_score order."""
+    windows = []
+    for c in range(columns - 3):
+        for r in range(rows):
+            windows.append([(r, c + i) for i in range(4)])
+    for c in range(columns):
+        for r in range(rows - 3):
+            windows.append([(r + i, c) for i in range(4)])
+    for c in range(columns - 3):
+        for r in range(rows - 3):
+            windows.append([(r + i, c + i) for i in range(4)])
+    for c in range(columns - 3):
+        for r in range(3, rows):
+            windows.append([(r - i, c + i) for i in range(4)])
+    return windows
+
+
+def _cell_windows(rows: int, columns: int) -> List[List[List[int]]]:
+    """Indices of the windows going through each cell, as [row][index]."""
+    cells = [[[] for _ in range(columns)] for _ in range(rows)]
+    for w, window in enumerate(_windows(rows, columns)):
+        for r, c in window:
+            cells[r][c].append(w)
+    return cells
+
+
+def _window_index(rows: int, columns: int) -> np.ndarray:
+    """Flat game_state indices of the cells of every window, shape (N_WINDOWS, 4)."""
+    return np.array([[r * columns + c for r, c in w] for w in _windows(rows, columns)], np.intp)
+
+
+def _relative_window_table(weights: Tuple[int, ...]) -> np.ndarray:
+    """Score of a window for player 1 minus player 2, indexed by [ones, twos]."""
+    table = np.zeros((5, 5), np.int64)
+    for n in range(5):
+        table[n, 0] += weights[n]
+        table[0, n] -= weights[n]
+    return table
+
+
+def _zobrist_table(rows: int, columns: int, seed: int) -> List[List[List[int]]]:
+    """Random 64-bit key of every (player id, row, index), identical in every process."""
+    rng = random.Random(seed)
+    return [[[rng.getrandbits(64) for _ in range(columns)] for _ in range(rows)] for _ in range(3)]
+
+
 class Board:
     """
     Main game controller class.
@@ -17,6 +73,26 @@ class Board:
     COLUMNS = 7
     EMPTY = 0
     MAX_SPACE_TO_WIN = 3  # Farthest space where a winning connection may start
+    DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))  # row/column steps of the four lines
+    MOVES_BY_MASK = _moves_by_mask(COLUMNS)
+
+    # Evaluation weights: a window scores WINDOW_WEIGHTS[n] for n own pieces
+    # and no opponent piece, and each piece scores its column's CENTER_WEIGHTS
+    WINDOW_WEIGHTS = (0, 0, 10, 100, 100_000)
+    CENTER_WEIGHTS = (0, 0, 2, 3, 2, 0, 0)
+    N_WINDOWS = len(_windows(ROWS, COLUMNS))
+    CELL_WINDOWS = _cell_windows(ROWS, COLUMNS)
+
+    # NumPy evaluation tables: flat cell indices of every window (N_WINDOWS, 4),
+    # per-cell center weights and the window score lookup
+    WINDOW_INDEX = _window_index(ROWS, COLUMNS)
+    CENTER_MASK = np.tile(np.array(CENTER_WEIGHTS, np.int64), (ROWS, 1))
+    RELATIVE_WINDOW_SCORE = _relative_window_table(WINDOW_WEIGHTS)
+    PLAYER_SIGN = np.array([0, 1, -1], np.int64)  # cell value -> +1 for player 1, -1 for player 2
+
+    # Zobrist keys, indexed [player_id][row][index]; fixed seed so keys are reproducible
+    ZOBRIST_SEED = 0x0C4F0E1
+    ZOBRIST = _zobrist_table(ROWS, COLUMNS, ZOBRIST_SEED)
     
     def __init__(self,  player1: PlayerT, player2: PlayerT):
         """
@@ -37,6 +113,15 @@ class Board:
 
         self.game_state: np.ndarray = np.zeros((self.ROWS, self.COLUMNS), np.int8)
         self.board_size = (self.COLUMNS, self.ROWS)
+        self.heights: List[int] = [0] * self.COLUMNS  # pieces per column
+        self.valid_mask: int = (1 << self.COLUMNS) - 1  # bit c-1 set while column c has room
+        self.move_stack: List[int] = []  # columns played, for undo()
+        # Incremental evaluation: pieces of each player (indexed by id) in
+        # every window, and the resulting pos_score of each player
+        self.window_counts: List[List[int]] = [[], [0] * self.N_WINDOWS, [0] * self.N_WINDOWS]
+        self.scores: List[int] = [0, 0, 0]
+        self.zobrist_key: int = 0  # XOR of the ZOBRIST keys of all pieces
+        self.mirror_key: int = 0  # zobrist_key of the position mirrored about the center column
     
     def _init_players(self, p1: PlayerT, p2: PlayerT) -> None:
         """
@@ -63,24 +148,44 @@ class Board:
         if not self.is_valid_column(column):
             return False
             
-        current_player = self.get_current_player()
-        self.place_piece(current_player.player_id, column)
+        self.play(column)
+        return True
+
+    def play(self, column: int) -> None:
+        """
+        Play the current player's piece in place, so that undo() can take it back.
+        The column must be valid; use make_move() for unchecked input.
+        
+        Args:
+            column: The column to place a piece (1-7)
+        """
+        current_player = self.players[self.current_player_idx]
+        row = self.place_piece(current_player.player_id, column)
+        self.move_stack.append(column)
         self.total_moves += 1
         
         # Check if this move resulted in a win
-        if self.detect_win(current_player.player_id):
+        if self.detect_win_from(row, column - 1):
             self.game_over = True
             self.winner = current_player
-            return True
-            
         # Check if board is full (draw)
-        if len(self.get_valid_moves()) == 0:
+        elif self.total_moves == self.ROWS * self.COLUMNS:
             self.game_over = True
-            return True
-            
         # Move to next player's turn
-        self.next_turn()
-        return True
+        else:
+            self.next_turn()
+
+    def undo(self) -> None:
+        """Take back the last move played, restoring the previous state in place."""
+        self.remove_piece(self.move_stack.pop())
+        self.total_moves -= 1
+        
+        # A finished game keeps the last mover as current player
+        if self.game_over:
+            self.game_over = False
+            self.winner = None
+        else:
+            self.next_turn()
         
     def is_valid_column(self, column: int) -> bool:
         """
@@ -92,7 +197,7 @@ class Board:
         Returns:
             Boolean indicating if the column is valid
         """
-        return 1 <= column <= self.COLUMNS and self.game_state[0, column - 1] == self.EMPTY
+        return 1 <= column <= self.COLUMNS and bool(self.valid_mask >> (column - 1) & 1)
 
     
     def get_valid_moves(self) -> List[int]:
@@ -102,7 +207,49 @@ class Board:
         Returns:
             List of valid columns (1-7)
         """
-        return [c for c in range(1, self.COLUMNS + 1) if self.is_valid_column(c)]
+        return self.MOVES_BY_MASK[self.valid_mask].copy()
+
+    def is_winning_move(self, column: int, player_id: int) -> bool:
+        """
+        Check if dropping a piece in a column would win, without playing it.
+        
+        Args:
+            column: A valid column (1-7)
+            player_id: ID of the player dropping the piece
+            
+        Returns:
+            Boolean indicating if the piece would complete four in a row
+        """
+        index = column - 1
+        return self.is_winning_cell(self.ROWS - 1 - self.heights[index], index, player_id)
+
+    def is_winning_cell(self, row: int, index: int, player_id: int) -> bool:
+        """
+        Check if a piece of `player_id` on an empty cell would complete four in a row.
+        
+        Args:
+            row: Row of the empty cell (0 is the top row)
+            index: Column index of the empty cell (0-6)
+            player_id: ID of the player
+        """
+        counts = self.window_counts[player_id]
+        for w in self.CELL_WINDOWS[row][index]:
+            if counts[w] == 3:  # the fourth cell is this empty cell
+                return True
+        return False
+
+    def gives_win_above(self, column: int, player_id: int) -> bool:
+        """
+        Check if dropping a piece in a column would let `player_id` win by
+        playing right on top of it.
+        
+        Args:
+            column: A valid column (1-7)
+            player_id: ID of the player who could win above
+        """
+        index = column - 1
+        row = self.ROWS - 2 - self.heights[index]  # cell above the landing cell
+        return row >= 0 and self.is_winning_cell(row, index, player_id)
 
     
     def place_piece(self, player_id, column):
@@ -112,18 +259,115 @@ class Board:
         Args:
             player_id: ID of the player (1 or 2)
             column: Column to place the piece (1-7)
+
+        Returns:
+            Row where the piece landed, or None if the column is full
+        """
+        index = column - 1
+        height = self.heights[index]
+        if height == self.ROWS:
+            return None
+        row = self.ROWS - 1 - height
+        self.game_state[row, index] = player_id
+        self.heights[index] = height + 1
+        if height + 1 == self.ROWS:
+            self.valid_mask &= ~(1 << index)
+        keys = self.ZOBRIST[player_id][row]
+        self.zobrist_key ^= keys[index]
+        self.mirror_key ^= keys[self.COLUMNS - 1 - index]
+
+        # Only the windows through this cell change score
+        opp = 3 - player_id
+        own_counts, opp_counts = self.window_counts[player_id], self.window_counts[opp]
+        weights = self.WINDOW_WEIGHTS
+        own_delta, opp_delta = self.CENTER_WEIGHTS[index], 0
+        for w in self.CELL_WINDOWS[row][index]:
+            n, o = own_counts[w], opp_counts[w]
+            own_counts[w] = n + 1
+            if o == 0:
+                own_delta += weights[n + 1] - weights[n]
+            elif n == 0:
+                opp_delta -= weights[o]  # window is now blocked for the opponent
+        self.scores[player_id] += own_delta
+        self.scores[opp] += opp_delta
+        return row
+
+    def remove_piece(self, column):
+        """
+        Remove the top piece of the specified column.
+        
+        Args:
+            column: Column to remove the piece from (1-7)
         """
         index = column - 1
-        for row in reversed(range(self.ROWS)):
-            if self.game_state[row][index] == self.EMPTY:
-                self.game_state[row][index] = player_id
-                return
+        height = self.heights[index] - 1
+        row = self.ROWS - 1 - height
+        player_id = int(self.game_state[row, index])
+        self.game_state[row, index] = self.EMPTY
+        self.heights[index] = height
+        self.valid_mask |= 1 << index
+        keys = self.ZOBRIST[player_id][row]
+        self.zobrist_key ^= keys[index]
+        self.mirror_key ^= keys[self.COLUMNS - 1 - index]
+
+        opp = 3 - player_id
+        own_counts, opp_counts = self.window_counts[player_id], self.window_counts[opp]
+        weights = self.WINDOW_WEIGHTS
+        own_delta, opp_delta = self.CENTER_WEIGHTS[index], 0
+        for w in self.CELL_WINDOWS[row][index]:
+            n, o = own_counts[w] - 1, opp_counts[w]
+            own_counts[w] = n
+            if o == 0:
+                own_delta += weights[n + 1] - weights[n]
+            elif n == 0:
+                opp_delta -= weights[o]  # window is open again for the opponent
+        self.scores[player_id] -= own_delta
+        self.scores[opp] -= opp_delta
     
 
+    def compute_zobrist_key(self, mirrored: bool = False) -> int:
+        """
+        Compute the Zobrist key of the position from scratch.
+        Used to verify the incrementally updated zobrist_key and mirror_key.
+        
+        Args:
+            mirrored: Compute the key of the mirrored position instead
+            
+        Returns:
+            64-bit key of the position
+        """
+        key = 0
+        for row in range(self.ROWS):
+            for index in range(self.COLUMNS):
+                pid = self.game_state[row, index]
+                if pid != self.EMPTY:
+                    key ^= self.ZOBRIST[pid][row][self.COLUMNS - 1 - index if mirrored else index]
+        return key
+
+    def canonical_key(self) -> Tuple[int, bool]:
+        """
+        Key shared by the position and its mirror image, for caches and books.
+        
+        Returns:
+            Tuple (key, mirrored); when mirrored is True, moves stored under
+            the key must go through mirror_column() to apply to this board
+        """
+        if self.mirror_key < self.zobrist_key:
+            return self.mirror_key, True
+        return self.zobrist_key, False
+
+    def mirror_column(self, column: int) -> int:
+        """Column (1-7) matching `column` on the mirrored board."""
+        return self.COLUMNS + 1 - column
+
     def shallow_copy(self) -> "Board":
         clone: "Board" = object.__new__(Board)          # bypass __init__
         clone.__dict__ = self.__dict__.copy()            # shallow copy of attrs
         clone.game_state = self.game_state.copy()        # *real* board copy
+        clone.heights = self.heights.copy()
+        clone.move_stack = self.move_stack.copy()
+        clone.window_counts = [counts.copy() for counts in self.window_counts]
+        clone.scores = self.scores.copy()
         clone.game_over = False                     # reset
         clone.winner = None                         # reset
         return clone
@@ -133,14 +377,15 @@ class Board:
     def apply_move(self, player_id: int, column: int) -> "Board":
         """Return a brand‑new Board after `player_id` drops in `column`."""
         nxt = self.shallow_copy()
-        nxt.place_piece(player_id, column)
+        row = nxt.place_piece(player_id, column)
+        nxt.move_stack.append(column)
         nxt.total_moves += 1
 
         # terminal detection
-        if nxt.detect_win(player_id):
+        if nxt.detect_win_from(row, column - 1):
             nxt.game_over = True
             nxt.winner = next(p for p in nxt.players if p.player_id == player_id)
-        elif len(nxt.get_valid_moves()) == 0:
+        elif nxt.total_moves == nxt.ROWS * nxt.COLUMNS:
             nxt.game_over = True
             nxt.winner = None
         else:
@@ -150,7 +395,8 @@ class Board:
 
     def detect_win(self, player_id)-> bool:
         """
-        Check if the specified player has won.
+        Check if the specified player has won by scanning the whole board.
+        Moves only use detect_win_from(); this full scan stays as a validator.
         
         Args:
             player_id: ID of the player to check for win
@@ -181,8 +427,50 @@ class Board:
         return False
     
 
+    def detect_win_from(self, row: int, index: int) -> bool:
+        """
+        Check if the piece at the given cell is part of four in a row.
+        Only the four lines through that cell are read, which is enough
+        to detect a win created by the piece just placed there.
+        
+        Args:
+            row: Row of the piece (0 is the top row)
+            index: Column index of the piece (0-6)
+            
+        Returns:
+            Boolean indicating if that piece completes a win
+        """
+        b = self.game_state
+        pid = b[row, index]
+        R, C = self.ROWS, self.COLUMNS
+        for dr, dc in self.DIRECTIONS:
+            count = 1
+            r, c = row + dr, index + dc
+            while 0 <= r < R and 0 <= c < C and b[r, c] == pid:
+                count += 1
+                r, c = r + dr, c + dc
+            r, c = row - dr, index - dc
+            while 0 <= r < R and 0 <= c < C and b[r, c] == pid:
+                count += 1
+                r, c = r - dr, c - dc
+            if count >= 4:
+                return True
+        return False
+    
+
     # evaluation (heuristic)
     def pos_score(self, pid: int) -> int:
+        """
+        Heuristic score of a player's position, kept up to date by
+        place_piece/remove_piece. Equal to scan_pos_score(pid).
+        
+        Args:
+            pid: ID of the player to score
+        """
+        return self.scores[pid]
+
+    def scan_pos_score(self, pid: int) -> int:
+        """Recompute pos_score from the whole board (slow validator)."""
         score = 0
         b = self.game_state
         # centre control
@@ -223,6 +511,100 @@ class Board:
     def relative_score(self, my_id: int) -> int:
         return self.pos_score(my_id) - self.pos_score(3 - my_id)
 
+    @classmethod
+    def evaluation_tables(cls, window_weights: Sequence[int],
+                          center_weights: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Build the tables of vectorized_scores for other evaluation weights.
+        
+        Args:
+            window_weights: Score of a window by its number of own pieces (5 values);
+                the last one must stay large enough to mark a win
+            center_weights: Score of a piece by its column (COLUMNS values)
+            
+        Returns:
+            Tuple (window table, center mask)
+        """
+        return (_relative_window_table(tuple(window_weights)),
+                np.tile(np.array(center_weights, np.int64), (cls.ROWS, 1)))
+
+    @classmethod
+    def vectorized_scores(cls, states: np.ndarray,
+                          tables: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> np.ndarray:
+        """
+        NumPy evaluation of one or more game states in a single pass.
+        
+        Args:
+            states: Array of shape (..., ROWS, COLUMNS) holding player ids
+            tables: Evaluation tables from evaluation_tables(), default the class weights
+            
+        Returns:
+            Array of shape (...) with pos_score(1) - pos_score(2) of each state
+        """
+        window_table, center_mask = tables if tables is not None else (cls.RELATIVE_WINDOW_SCORE, cls.CENTER_MASK)
+        flat = states.reshape(states.shape[:-2] + (cls.ROWS * cls.COLUMNS,))
+        windows = flat[..., cls.WINDOW_INDEX]  # (..., N_WINDOWS, 4)
+        ones = np.count_nonzero(windows == 1, axis=-1)
+        twos = np.count_nonzero(windows == 2, axis=-1)
+        score = window_table[ones, twos].sum(axis=-1)
+        score += (center_mask * cls.PLAYER_SIGN[states]).sum(axis=(-2, -1))
+        return score
+
+    def vectorized_relative_score(self, my_id: int,
+                                  tables: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> int:
+        """
+        Same value as relative_score, computed from game_state with NumPy.
+        
+        Args:
+            my_id: ID of the player the score is relative to
+            tables: Evaluation tables from evaluation_tables(), default the class weights
+        """
+        score = int(self.vectorized_scores(self.game_state, tables))
+        return score if my_id == 1 else -score
+
+    def child_states(self, columns: List[int]) -> np.ndarray:
+        """
+        Stack the positions reached by the current player dropping a piece
+        in each of the given columns.
+        
+        Args:
+            columns: Valid columns to play (1-7)
+            
+        Returns:
+            Array of shape (len(columns), ROWS, COLUMNS)
+        """
+        index = np.asarray(columns, np.intp) - 1
+        rows = self.ROWS - 1 - np.asarray(self.heights, np.intp)[index]
+        states = np.repeat(self.game_state[np.newaxis], len(columns), axis=0)
+        states[np.arange(len(columns)), rows, index] = self.get_current_player().player_id
+        return states
+
+    def batch_relative_score(self, columns: List[int], my_id: int,
+                             tables: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> np.ndarray:
+        """
+        relative_score of every child position in one vectorized call.
+        
+        Args:
+            columns: Valid columns to play (1-7) for the current player
+            my_id: ID of the player the scores are relative to
+            tables: Evaluation tables from evaluation_tables(), default the class weights
+            
+        Returns:
+            Array with one score per column
+        """
+        scores = self.vectorized_scores(self.child_states(columns), tables)
+        return scores if my_id == 1 else -scores
+
+
+    def to_bitboard(self) -> BitBoard:
+        """
+        Build the bitboard equivalent of the current position.
+
+        Returns:
+            BitBoard with the current player to move
+        """
+        return BitBoard.from_game_state(self.game_state, self.get_current_player().player_id)
+
 
     def get_current_player(self)-> PlayerT:
         """
@@ -256,7 +638,10 @@ class Board:
         return self.winner
     
     def reset_game(self):
-        """Reset the game to initial state."""
+        """Reset the game to initial state, and the search state AI players keep between moves."""
+        for player in self.players:
+            if player.playertype == "AI":
+                player.new_game()
         self.__init__(self.players[0], self.players[1])  # rebuild fresh
 
     def __str__(self):  # quick text view for debugging
@@ -0,0 +1,121 @@
+import os
+import time
+import numpy as np
+from typing import Optional, Tuple
+
+# Default location of the book built by `python src/main.py --build-book`
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "opening_book.bin")
+
+# One packed 13-byte record per position, sorted by key
+BOOK_DTYPE = np.dtype([("key", "<u8"), ("move", "u1"), ("score", "<i4")])
+
+
+class OpeningBook:
+    """
+    Read-only opening book backed by a memory-mapped file.
+
+    The file is a sorted array of (canonical position key, best move, score)
+    records, so a lookup is a binary search touching a few pages of the file
+    and the book is never loaded into memory as a whole. Keys and moves are
+    in the orientation given by Board.canonical_key().
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a book file.
+
+        Args:
+            path: File written by generate_opening_book
+        """
+        self.path = path
+        if os.path.getsize(path) == 0:  # np.memmap cannot map an empty file
+            self.entries = np.zeros(0, BOOK_DTYPE)
+        else:
+            self.entries = np.memmap(path, dtype=BOOK_DTYPE, mode="r")
+        self.keys = self.entries["key"]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, board) -> Optional[Tuple[int, int]]:
+        """
+        Find the current position of a board in the book.
+
+        Args:
+            board: The game board object
+
+        Returns:
+            Tuple (column, score) for the side to move, or None if the position is not in the book
+        """
+        key, mirrored = board.canonical_key()
+        keys = self.keys
+        lo, hi = 0, len(keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if int(keys[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(keys) or int(keys[lo]) != key:
+            return None
+        _, move, score = self.entries[lo].tolist()
+        return (board.mirror_column(move) if mirrored else move), score
+
+    def lookup_move(self, board) -> Optional[int]:
+        """
+        Get the book move for the current position of a board.
+
+        Returns:
+            A valid column (1-7), or None if the position is not in the book
+        """
+        hit = self.lookup(board)
+        if hit is None or not board.is_valid_column(hit[0]):
+            return None
+        return hit[0]
+
+
+def generate_opening_book(path: str = DEFAULT_BOOK_PATH, plies: int = 4, depth: int = 8,
+                          engine: str = "pvs", verbose: bool = True) -> int:
+    """
+    Search every position reachable in at most `plies` moves and write the book.
+    Mirror images are only searched once.
+
+    Args:
+        path: Output file
+        plies: Deepest position (number of pieces) stored
+        depth: Search depth used for each position
+        engine: AiPlayer engine used for the searches
+        verbose: Print progress
+
+    Returns:
+        Number of positions written
+    """
+    # Imported here because Board imports AiPlayer, which imports this module
+    from game.Board import Board
+    from game.AiPlayer import AiPlayer
+
+    board = Board(AiPlayer(1, depth, engine=engine), AiPlayer(2, depth, engine=engine))
+    book = {}
+    start_time = time.time()
+
+    def visit():
+        key, mirrored = board.canonical_key()
+        if key in book or board.game_over:
+            return
+        col, score = board.get_current_player().get_move_and_score(board)
+        book[key] = (board.mirror_column(col) if mirrored else col, int(score))
+        if verbose and len(book) % 100 == 0:
+            print(f"  {len(book):,} positions searched ({time.time() - start_time:.0f} s)")
+        if board.total_moves < plies:
+            for c in board.get_valid_moves():
+                board.play(c)
+                visit()
+                board.undo()
+
+    visit()
+    entries = np.array(sorted((key, move, score) for key, (move, score) in book.items()), dtype=BOOK_DTYPE)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    entries.tofile(path)
+    if verbose:
+        print(f"Opening book with {len(entries):,} positions written to {path}")
+    return len(entries)
@@ -0,0 +1,335 @@
+import math
+import os
+import random
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+CANCEL_POLL_S = 0.05  # how often a search waiting for its workers looks at its cancel event
+
+# State of a worker process, set once by _init_worker
+_player = None
+_shared_alpha = None
+
+
+def _init_worker(shared_alpha, player_config: Dict, tt=None, stop=None) -> None:
+    """
+    Pool initializer: keep the shared state and build the worker's own AiPlayer.
+
+    Args:
+        shared_alpha: Best root score of the current root-split search
+        player_config: AiPlayer keyword arguments
+        tt: Shared transposition table replacing the player's own
+        stop: Event that aborts the worker's search when set
+    """
+    global _player, _shared_alpha
+    # Imported here because Board imports AiPlayer, which imports this module
+    from game.AiPlayer import AiPlayer
+
+    _shared_alpha = shared_alpha
+    _player = AiPlayer(**player_config)
+    if tt is not None:
+        _player.tt = tt
+    _player.stop_event = stop
+
+
+def _replay(moves: List[int]):
+    """Rebuild a position from the columns played since the empty board."""
+    from game.Board import Board
+    from game.HumanPlayer import HumanPlayer
+
+    board = Board(HumanPlayer(1), HumanPlayer(2))
+    for c in moves:
+        board.play(c)
+    return board
+
+
+def _wait(futures, cancel=None, timeout: Optional[float] = None) -> bool:
+    """
+    Wait for worker tasks, watching a cancel event.
+
+    Args:
+        futures: Futures of the tasks
+        cancel: threading.Event that ends the wait when set
+        timeout: Longest wait in seconds
+
+    Returns:
+        True if all the tasks finished, False if cancel was set or the timeout passed first
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    pending = futures
+    while pending:
+        if cancel is not None and cancel.is_set():
+            return False
+        poll = CANCEL_POLL_S if cancel is not None else None
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            poll = remaining if poll is None else min(poll, remaining)
+        _, pending = wait(pending, timeout=poll)
+    return True
+
+
+def _search_move(moves: List[int], column: int, depth: int, seed: int) -> Tuple[int, float, int, int]:
+    """
+    Search one root move in a worker.
+
+    The window starts just below the best root score found so far by any
+    worker, so a move that cannot beat it fails low quickly. A move that
+    reaches that score still gets its exact value, which keeps the final
+    choice independent of the order in which the workers finish.
+
+    Args:
+        moves: Columns played from the empty board to the root position
+        column: Root move to search
+        depth: Depth of the root search
+        seed: Seed of the random tie-breaks, fixed per root move
+
+    Returns:
+        Tuple (column, score, nodes, worker pid) with the score from the root player's point of view
+    """
+    random.seed(seed * 8 + column)
+    alpha = _shared_alpha.value - 1  # scores are integers
+    score = _player.search_root_move(_replay(moves), column, depth, alpha)
+    with _shared_alpha.get_lock():
+        if score > _shared_alpha.value:
+            _shared_alpha.value = score
+    return column, score, _player.nodes_evaluated, os.getpid()
+
+
+class ParallelSearch:
+    """
+    Root-split search over a pool of worker processes.
+
+    The first root move (in move-ordering order) is searched alone to get a
+    good bound, then the remaining moves are searched in parallel. Workers
+    share the best root score in a multiprocessing Value so that later moves
+    are searched with a narrower window. The result only depends on the
+    position and the seed, not on the scheduling of the workers.
+    """
+
+    def __init__(self, workers: int, player_config: Dict, seed: int = 0):
+        """
+        Start the worker pool.
+
+        Args:
+            workers: Number of worker processes
+            player_config: AiPlayer keyword arguments used to build each worker's player
+            seed: Base seed of the random tie-breaks in the workers
+        """
+        self.workers = workers
+        self.seed = seed
+        self.shared_alpha = mp.Value("d", -math.inf)
+        self.stop = mp.Event()
+        self.pool = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                        initargs=(self.shared_alpha, player_config, None, self.stop))
+        self.worker_nodes: List[int] = []  # nodes searched by each worker in the last search
+
+    def search(self, board, depth: int, moves: List[int], cancel=None) -> Tuple[Optional[int], float]:
+        """
+        Search the given root moves of a position.
+
+        Args:
+            board: The game board object, with the searching player to move
+            depth: Search depth
+            moves: Root moves in search order
+            cancel: threading.Event that aborts the search when set
+
+        Returns:
+            Tuple (column, score); ties go to the earliest move in `moves`.
+            Column is None if the search was cancelled
+        """
+        history = list(board.move_stack)
+        self.shared_alpha.value = -math.inf
+        self.stop.clear()
+        self.worker_nodes = []
+        futures = [self.pool.submit(_search_move, history, moves[0], depth, self.seed)]
+        if _wait(futures, cancel):
+            futures += [self.pool.submit(_search_move, history, c, depth, self.seed) for c in moves[1:]]
+        if not _wait(futures, cancel):
+            self.stop.set()  # the running tasks abort, the others are dropped
+            for f in futures:
+                f.cancel()
+            wait(futures)
+            return None, -math.inf
+        results = [f.result() for f in futures]
+        nodes_by_worker = {}
+        for _, _, nodes, pid in results:
+            nodes_by_worker[pid] = nodes_by_worker.get(pid, 0) + nodes
+        self.worker_nodes = list(nodes_by_worker.values())
+        best_col, best_score = None, -math.inf
+        for c, score, _, _ in results:
+            if score > best_score:
+                best_col, best_score = c, score
+        return best_col, best_score
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self.pool.shutdown()
+
+
+def _smp_search(moves: List[int], index: int, max_depth: int,
+                generation: int) -> Tuple[int, Optional[int], float, int, int]:
+    """
+    Iterative deepening in one Lazy SMP worker, until `max_depth` or the stop event.
+
+    Worker 0 searches in the normal move order; the helpers use a shuffled
+    center-out order (seeded by their index) so they explore other parts
+    of the tree first and fill the shared table for the others.
+
+    Args:
+        moves: Columns played from the empty board to the root position
+        index: Worker number (0 is the main search)
+        max_depth: Deepest iteration
+        generation: Age of the entries written to the shared table
+
+    Returns:
+        Tuple (index, column, score, completed depth, nodes)
+    """
+    order = list(_player.CENTER_ORDER)
+    if index:
+        helpers = order[1:]
+        random.Random(index).shuffle(helpers)
+        order[1:] = helpers
+    _player.tt.generation = generation
+    col, score, completed = _player.search_until_stopped(_replay(moves), max_depth, order)
+    return index, col, score, completed, _player.nodes_evaluated
+
+
+def _ponder_search(moves: List[int], generation: int) -> Tuple[Dict[int, Tuple[int, float, int]], int]:
+    """
+    Pondering in the worker: AiPlayer.search_replies on the position, until the stop event.
+
+    Args:
+        moves: Columns played from the empty board to the position, opponent to move
+        generation: Age of the entries written to the shared table
+
+    Returns:
+        Tuple (ponder results, nodes): the best answer to each searched reply,
+        keyed by the Zobrist key after the reply (see AiPlayer.ponder_results)
+    """
+    if _player.tt is not None:
+        _player.tt.generation = generation
+    results = _player.search_replies(_replay(moves))
+    return results, _player.nodes_evaluated
+
+
+class Ponderer:
+    """
+    Pondering in a worker process, so that it does not compete for the GIL
+    with the searches of the main process (the GUI or the other AI).
+
+    The worker's player shares the caller's SharedTranspositionTable, if it
+    has one, so the entries written while pondering also speed up the real
+    search.
+    """
+
+    def __init__(self, player_config: Dict, tt=None):
+        """
+        Start the worker process.
+
+        Args:
+            player_config: AiPlayer keyword arguments used to build the worker's player
+            tt: SharedTranspositionTable to search with, None for the player's own table
+        """
+        self.stop = mp.Event()
+        self.pool = ProcessPoolExecutor(1, initializer=_init_worker, initargs=(None, player_config, tt, self.stop))
+        self.future = None
+
+    @property
+    def running(self) -> bool:
+        return self.future is not None
+
+    def start(self, board, generation: int = 0) -> None:
+        """
+        Start pondering a position in the background.
+
+        Args:
+            board: The game board object, with the opponent to move
+            generation: Age of the entries written to the shared table
+        """
+        self.stop.clear()
+        self.future = self.pool.submit(_ponder_search, list(board.move_stack), generation)
+
+    def finish(self) -> Tuple[Dict[int, Tuple[int, float, int]], int]:
+        """
+        Stop pondering and wait for the worker.
+
+        Returns:
+            Tuple (ponder results, nodes) of the search, ({}, 0) if none was running
+        """
+        if self.future is None:
+            return {}, 0
+        self.stop.set()
+        results = self.future.result()
+        self.future = None
+        return results
+
+    def close(self) -> None:
+        """Stop the worker process."""
+        self.stop.set()
+        self.pool.shutdown()
+
+
+class LazySMP:
+    """
+    Lazy SMP: every worker runs the same iterative deepening search, sharing
+    nothing but a SharedTranspositionTable.
+
+    The helpers search in a different move order, and half of them one ply
+    deeper, so their table entries cut or order the main worker's search.
+    The main worker's result is the one played; the helpers are stopped as
+    soon as it finishes.
+    """
+
+    def __init__(self, workers: int, player_config: Dict, tt):
+        """
+        Start the worker pool.
+
+        Args:
+            workers: Number of worker processes
+            player_config: AiPlayer keyword arguments used to build each worker's player
+            tt: SharedTranspositionTable used by all the workers
+        """
+        self.workers = workers
+        self.tt = tt
+        self.stop = mp.Event()
+        self.pool = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                        initargs=(None, player_config, tt, self.stop))
+        self.worker_nodes: List[int] = []  # nodes searched by each worker in the last search
+
+    def search(self, board, depth: int, time_limit_ms: Optional[float] = None,
+               cancel=None) -> Tuple[Optional[int], float, int]:
+        """
+        Search a position with all the workers.
+
+        Args:
+            board: The game board object, with the searching player to move
+            depth: Depth of the main search (ignored with a time limit)
+            time_limit_ms: Deepen until this much time has passed instead
+            cancel: threading.Event that stops the search early when set
+
+        Returns:
+            Tuple (column, score, depth) of the main worker's last completed iteration;
+            column is None if not even depth 1 completed
+        """
+        moves = list(board.move_stack)
+        empty = board.ROWS * board.COLUMNS - board.total_moves
+        self.stop.clear()
+        futures = []
+        for i in range(self.workers):
+            max_depth = empty if time_limit_ms is not None else min(empty, depth + i % 2)
+            futures.append(self.pool.submit(_smp_search, moves, i, max_depth, self.tt.generation))
+        _wait(futures[:1], cancel, time_limit_ms / 1000 if time_limit_ms is not None else None)
+        self.stop.set()
+        results = [f.result() for f in futures]
+        self.worker_nodes = [nodes for *_, nodes in results]
+        _, col, score, completed, _ = results[0]
+        return col, score, completed
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self.stop.set()
+        self.pool.shutdown()
@@ -0,0 +1,327 @@
+import math
+import os
+import sqlite3
+from typing import Callable, Optional, Tuple
+from game.BitBoard import BitBoard, ROWS, COLUMNS, column_mask
+from game.TranspositionTable import TranspositionTable
+
+CELLS = ROWS * COLUMNS
+
+# Default location of the solved-position cache shared by all runs
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "solutions.sqlite")
+
+
+class SolutionCache:
+    """
+    Persistent key/value store of solved positions: canonical BitBoard key ->
+    1 (win), 0 (draw) or -1 (loss) for the side to move.
+
+    Backed by an SQLite file in WAL mode, so several processes can read and
+    write it at the same time. Writes are buffered and committed in batches.
+    """
+
+    FLUSH_SIZE = 1000  # pending results written per transaction
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        Open (or create) a cache file.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS solutions (key INTEGER PRIMARY KEY, result INTEGER NOT NULL)")
+        self.conn.commit()
+        self.pending = {}
+
+    def __len__(self):
+        self.flush()
+        return self.conn.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def get(self, key: int) -> Optional[int]:
+        """Get the stored result of a position, or None if it was never solved."""
+        result = self.pending.get(key)
+        if result is None:
+            row = self.conn.execute("SELECT result FROM solutions WHERE key = ?", (key,)).fetchone()
+            result = row[0] if row else None
+        return result
+
+    def put(self, key: int, result: int) -> None:
+        """Record the result (1, 0 or -1) of a position."""
+        self.pending[key] = result
+        if len(self.pending) >= self.FLUSH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the pending results to the file."""
+        if self.pending:
+            self.conn.executemany("INSERT OR REPLACE INTO solutions VALUES (?, ?)", self.pending.items())
+            self.conn.commit()
+            self.pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+
+class Solver:
+    """
+    Exact Connect Four solver: negamax with alpha-beta to the end of the game.
+
+    Scores are from the point of view of the side to move: 0 for a draw,
+    positive for a win and negative for a loss, with a larger magnitude the
+    earlier the game ends: winning with the next stone when `moves` stones
+    are on the board scores (CELLS + 1 - moves) // 2, so faster wins score
+    higher and slower losses less negative.
+
+    Results go into a TranspositionTable under the (mirror-canonical)
+    BitBoard key with depth SOLVED_DEPTH, so a table can be shared with the
+    heuristic search: the keys never collide with Zobrist keys in practice
+    and solved entries win the depth-preferred slot. With a SolutionCache,
+    win/draw/loss results of the nodes near the root are also read from and
+    written to disk.
+
+    A `check` callback, when set, is called every CHECK_INTERVAL nodes and
+    may raise to abort the solve (AiPlayer uses it for its time and node
+    budgets and for cancellation).
+    """
+
+    SOLVED_DEPTH = 127  # depth marker of solved entries (the largest int8)
+    MOVE_ORDER = (4, 3, 5, 2, 6, 1, 7)  # center first
+    CHECK_INTERVAL = 1024  # nodes between two calls of `check`
+
+    def __init__(self, tt: Optional[TranspositionTable] = None, tt_size_mb: float = 16,
+                 cache: Optional[SolutionCache] = None, cache_plies: int = 6):
+        """
+        Create a solver.
+
+        Args:
+            tt: Transposition table to share (for example AiPlayer.tt)
+            tt_size_mb: Size of the table created when none is given
+            cache: Persistent cache of solved positions
+            cache_plies: Only nodes up to this many plies below the position being
+                solved use the cache (deeper ones are too many and too cheap)
+        """
+        self.tt = tt if tt is not None else TranspositionTable(tt_size_mb)
+        self.nodes = 0
+        self.cache = cache
+        self.cache_plies = cache_plies
+        self._cache_limit = -1  # deepest node (stone count) using the cache
+        self._column_masks = [column_mask(c) for c in self.MOVE_ORDER]
+        self.check: Optional[Callable[[], None]] = None  # called every CHECK_INTERVAL nodes
+        self._next_check = math.inf
+
+    @staticmethod
+    def min_score(pos: BitBoard) -> int:
+        """Worst possible score of the side to move (loss to the opponent's next stone)."""
+        return -((CELLS - pos.moves) // 2)
+
+    @staticmethod
+    def max_score(pos: BitBoard) -> int:
+        """Best possible score of the side to move (win with its next stone)."""
+        return (CELLS + 1 - pos.moves) // 2
+
+    def solve(self, pos: BitBoard, weak: bool = False) -> int:
+        """
+        Exact score of a position, found by a sequence of null-window searches.
+
+        Args:
+            pos: Position to solve (left unchanged)
+            weak: Only tell win (1), draw (0) and loss (-1) apart, which is much cheaper
+
+        Returns:
+            Score for the side to move
+        """
+        if pos.winning_moves():
+            return 1 if weak else self.max_score(pos)
+        if self.check is None:
+            self._next_check = math.inf
+        else:  # best_move solves every child: keep the count running across them
+            self._next_check = min(self._next_check, self.nodes + self.CHECK_INTERVAL)
+        if self.cache is not None:
+            self._cache_limit = pos.moves + self.cache_plies
+        try:
+            if weak:
+                r = self.negamax(pos, -1, 1)
+                return (r > 0) - (r < 0)
+            return self._solve_strong(pos)
+        finally:
+            if self.cache is not None:
+                self.cache.flush()
+
+    def _solve_strong(self, pos: BitBoard) -> int:
+        lo, hi = self.min_score(pos), self.max_score(pos)
+        while lo < hi:
+            # bisect, but try scores near 0 first: they are the cheapest to refute
+            med = lo + (hi - lo) // 2
+            if med <= 0 and lo // 2 < med:
+                med = lo // 2
+            elif med >= 0 and hi // 2 > med:
+                med = hi // 2
+            r = self.negamax(pos, med, med + 1)
+            if r <= med:
+                hi = r
+            else:
+                lo = r
+        return lo
+
+    def best_move(self, pos: BitBoard, weak: bool = False) -> Tuple[int, int]:
+        """
+        Pick the move with the best exact score; ties go to the most central column.
+
+        Args:
+            pos: Position to solve (left unchanged)
+            weak: Only tell win, draw and loss apart (see solve)
+
+        Returns:
+            Tuple (column, score) for the side to move
+        """
+        best_col, best_score = 0, None
+        for c in self.MOVE_ORDER:
+            if not pos.can_play(c):
+                continue
+            if pos.is_winning_move(c):
+                return c, 1 if weak else self.max_score(pos)
+            child = pos.copy()
+            child.play(c)
+            if child.is_full():
+                score = 0
+            else:
+                score = -self.solve(child, weak)
+            if best_score is None or score > best_score:
+                best_col, best_score = c, score
+                if weak and score == 1:
+                    break  # any winning move will do
+        return best_col, best_score
+
+    def negamax(self, pos: BitBoard, alpha: int, beta: int) -> int:
+        """
+        Alpha-beta negamax to the end of the game. The side to move must not
+        have an immediate win (solve and best_move check that first).
+
+        Args:
+            pos: Position to search (left unchanged)
+            alpha: Lower bound of the window
+            beta: Upper bound of the window
+
+        Returns:
+            The exact score if it is inside (alpha, beta), else a bound on the
+            side it falls out of
+        """
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self._next_check = self.nodes + self.CHECK_INTERVAL
+            self.check()
+        next_moves = pos.possible_non_losing_moves()
+        if next_moves == 0:
+            return -((CELLS - pos.moves) // 2)  # every move lets the opponent win next
+        if pos.moves >= CELLS - 2:
+            return 0  # the last two stones cannot win any more
+
+        lo = -((CELLS - 2 - pos.moves) // 2)  # the opponent cannot win with its next stone
+        if alpha < lo:
+            alpha = lo
+            if alpha >= beta:
+                return alpha
+        hi = (CELLS - 1 - pos.moves) // 2  # we cannot win with this stone
+        if beta > hi:
+            beta = hi
+            if alpha >= beta:
+                return beta
+
+        key, mirrored = pos.canonical_key()
+        tt_move = 0
+        cached = pos.moves <= self._cache_limit
+        entry = self.tt.probe(key)
+        if entry is None or entry[0] != self.SOLVED_DEPTH:
+            entry = self._probe_cache(key) if cached else None
+        if entry is not None:
+            _, flag, score, tt_move = entry
+            if flag == TranspositionTable.EXACT:
+                return score
+            if flag == TranspositionTable.LOWER:
+                if score >= beta:
+                    return score
+                alpha = max(alpha, score)
+            elif flag == TranspositionTable.UPPER:
+                if score <= alpha:
+                    return score
+                beta = min(beta, score)
+            if mirrored and tt_move:
+                tt_move = COLUMNS + 1 - tt_move
+
+        # order by the number of threats each move creates, center first on ties
+        moves = []
+        for i, c in enumerate(self.MOVE_ORDER):
+            move = next_moves & self._column_masks[i]
+            if move:
+                moves.append((c == tt_move, pos.move_score(move), -i, move, c))
+        moves.sort(reverse=True)
+
+        alpha_orig = alpha
+        best_col = moves[0][4]
+        for _, _, _, move, c in moves:
+            child = BitBoard(pos.current, pos.mask, pos.moves)
+            child.play_move(move)
+            score = -self.negamax(child, -beta, -alpha)
+            if score >= beta:
+                self._store(key, mirrored, TranspositionTable.LOWER, score, c, cached)
+                return score
+            if score > alpha:
+                alpha, best_col = score, c
+        flag = TranspositionTable.UPPER if alpha <= alpha_orig else TranspositionTable.EXACT
+        self._store(key, mirrored, flag, alpha, best_col, cached)
+        return alpha
+
+    def _probe_cache(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        """Read a cached result as a TT-style (depth, flag, bound, move) entry."""
+        result = self.cache.get(key)
+        if result is None:
+            return None
+        if result > 0:
+            return self.SOLVED_DEPTH, TranspositionTable.LOWER, 1, 0  # won: score >= 1
+        if result < 0:
+            return self.SOLVED_DEPTH, TranspositionTable.UPPER, -1, 0  # lost: score <= -1
+        return self.SOLVED_DEPTH, TranspositionTable.EXACT, 0, 0
+
+    def _store(self, key: int, mirrored: bool, flag: int, score: int, col: int, cached: bool = False) -> None:
+        self.tt.store(key, self.SOLVED_DEPTH, flag, score, COLUMNS + 1 - col if mirrored else col)
+        if cached:
+            # keep the result when the bound is enough to know the outcome
+            if flag == TranspositionTable.EXACT:
+                self.cache.put(key, (score > 0) - (score < 0))
+            elif flag == TranspositionTable.LOWER and score > 0:
+                self.cache.put(key, 1)
+            elif flag == TranspositionTable.UPPER and score < 0:
+                self.cache.put(key, -1)
+
+
+def solve(board, cache_path: Optional[str] = DEFAULT_CACHE_PATH, tt_size_mb: float = 64) -> int:
+    """
+    Weakly solve a Board position: find the outcome under perfect play.
+    Works from any position, including the empty board, but early positions
+    can take a long time; solved positions are kept in the cache file, so
+    later calls (from any process) reuse them.
+
+    Args:
+        board: The game board object
+        cache_path: SolutionCache file, or None to solve without one
+        tt_size_mb: Memory used by the transposition table
+
+    Returns:
+        1 if the player to move wins, 0 for a draw, -1 if it loses
+        (for a finished game, 1 if the current player is the winner)
+    """
+    if board.game_over:
+        if board.winner is None:
+            return 0
+        return 1 if board.winner is board.get_current_player() else -1
+    cache = SolutionCache(cache_path) if cache_path else None
+    try:
+        return Solver(tt_size_mb=tt_size_mb, cache=cache).solve(board.to_bitboard(), weak=True)
+    finally:
+        if cache is not None:
+            cache.close()
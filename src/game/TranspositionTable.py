@@ -0,0 +1,221 @@
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+MASK64 = (1 << 64) - 1
+
+
+def mix_key(key: int) -> int:
+    """
+    Scramble a 64-bit key (splitmix64 finalizer) so that every bit of it
+    affects the bucket index. Zobrist keys are random already, but BitBoard
+    keys (used by the Solver) have long runs of fixed low bits.
+    """
+    key = ((key ^ (key >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    key = ((key ^ (key >> 27)) * 0x94D049BB133111EB) & MASK64
+    return key ^ (key >> 31)
+
+
+class TranspositionTable:
+    """
+    Fixed-size cache of search results indexed by position key.
+
+    Entries live in a preallocated NumPy structured array of two-slot
+    buckets: slot 0 keeps the deepest result seen for the bucket and slot 1
+    is always replaced, so the memory used never grows during a session.
+    Scores are stored from the point of view of the side to move.
+
+    The table is kept across the moves of a game: every entry records the
+    search (generation) that wrote it, and slot 0 entries left by earlier
+    searches are replaced whatever their depth.
+    """
+
+    # Bound types
+    EMPTY = 0
+    EXACT = 1
+    LOWER = 2  # score is a lower bound (fail high)
+    UPPER = 3  # score is an upper bound (fail low)
+    NEGATED_FLAG = (EMPTY, EXACT, UPPER, LOWER)  # bound type seen from the other side
+
+    ENTRY_DTYPE = np.dtype([
+        ("key", np.uint64),
+        ("score", np.int32),
+        ("depth", np.int8),
+        ("flag", np.uint8),
+        ("move", np.int8),
+        ("age", np.uint8),
+    ])
+
+    def __init__(self, size_mb: float = 16):
+        """
+        Allocate the table.
+
+        Args:
+            size_mb: Memory used by the entries, in megabytes
+        """
+        self.n_buckets = max(1, int(size_mb * 2 ** 20) // (2 * self.ENTRY_DTYPE.itemsize))
+        self.entries = np.zeros((self.n_buckets, 2), dtype=self.ENTRY_DTYPE)
+        self.generation = 0  # age written into new entries
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self) -> None:
+        """Start a new search: older entries stay readable but become replaceable."""
+        self.generation = (self.generation + 1) & 0xFF
+
+    def clear(self) -> None:
+        """Empty every entry (only the flags are reset, which is enough and much cheaper)."""
+        self.entries["flag"] = self.EMPTY
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Look up a position.
+
+        Args:
+            key: 64-bit position key
+
+        Returns:
+            Tuple (depth, flag, score, move) if the position is stored, else None
+        """
+        self.probes += 1
+        for e_key, score, depth, flag, move, _ in self.entries[mix_key(key) % self.n_buckets].tolist():
+            if e_key == key and flag != self.EMPTY:
+                self.hits += 1
+                return depth, flag, score, move
+        return None
+
+    def store(self, key: int, depth: int, flag: int, score: int, move: int) -> None:
+        """
+        Store a search result, keeping the deeper entry of the current search in slot 0.
+
+        Args:
+            key: 64-bit position key
+            depth: Remaining search depth the score was computed with
+            flag: EXACT, LOWER or UPPER
+            score: Score from the point of view of the side to move
+            move: Best move found (1-7)
+        """
+        bucket = self.entries[mix_key(key) % self.n_buckets]
+        first_key, _, first_depth, first_flag, _, first_age = bucket[0].tolist()
+        slot = 0 if (first_flag == self.EMPTY or first_key == key or first_age != self.generation
+                     or depth >= first_depth) else 1
+        bucket[slot] = (key, score, depth, flag, move, self.generation)
+
+    def usage(self) -> float:
+        """Fraction of the slots that hold an entry."""
+        return float(np.count_nonzero(self.entries["flag"])) / self.entries.size
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    Transposition table in shared memory, usable by several processes at once.
+
+    Each entry is two 64-bit words: the packed data (score, depth, flag, move,
+    age) and the key XORed with that data. There are no locks: a reader
+    recomputes key ^ data and ignores the entry unless it matches, which
+    rejects entries torn by two processes writing the same slot at once.
+    The table is created by one process and attached by name (or by
+    pickling it) in its worker processes; only the creator frees the memory.
+    """
+
+    SCORE_MASK = (1 << 32) - 1
+
+    def __init__(self, size_mb: float = 16, name: Optional[str] = None):
+        """
+        Create a table, or attach to an existing one.
+
+        Args:
+            size_mb: Memory used by the entries, in megabytes
+            name: Name of the shared memory block to attach to, None to create a new one
+        """
+        self.size_mb = size_mb
+        self.n_buckets = max(1, int(size_mb * 2 ** 20) // (2 * 16))
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.n_buckets * 2 * 16)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.entries = np.ndarray((self.n_buckets, 2, 2), dtype=np.uint64, buffer=self.shm.buf)
+        if self.owner:
+            self.entries.fill(0)
+        self.generation = 0  # set by the searching process, see LazySMP
+        self.probes = 0
+        self.hits = 0
+
+    def __reduce__(self):
+        return self.__class__, (self.size_mb, self.name)
+
+    @classmethod
+    def _pack(cls, depth: int, flag: int, score: int, move: int, age: int = 0) -> int:
+        return ((int(score) & cls.SCORE_MASK) | (depth & 0xFF) << 32 | flag << 40
+                | (move & 0xFF) << 48 | age << 56)
+
+    @classmethod
+    def _unpack(cls, data: int) -> Tuple[int, int, int, int]:
+        score = data & cls.SCORE_MASK
+        if score >> 31:
+            score -= 1 << 32
+        depth = (data >> 32) & 0xFF
+        if depth >> 7:
+            depth -= 1 << 8
+        move = (data >> 48) & 0xFF
+        if move >> 7:
+            move -= 1 << 8
+        return depth, (data >> 40) & 0xFF, score, move
+
+    def clear(self) -> None:
+        """Empty every entry (a zero entry only matches key 0 and has the EMPTY flag)."""
+        self.entries.fill(0)
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Look up a position.
+
+        Args:
+            key: 64-bit position key
+
+        Returns:
+            Tuple (depth, flag, score, move) if the position is stored, else None
+        """
+        self.probes += 1
+        for check, data in self.entries[mix_key(key) % self.n_buckets].tolist():
+            if check ^ data == key and (data >> 40) & 0xFF != self.EMPTY:
+                self.hits += 1
+                return self._unpack(data)
+        return None
+
+    def store(self, key: int, depth: int, flag: int, score: int, move: int) -> None:
+        """
+        Store a search result, keeping the deeper entry of the current search in slot 0.
+
+        Args:
+            key: 64-bit position key
+            depth: Remaining search depth the score was computed with
+            flag: EXACT, LOWER or UPPER
+            score: Score from the point of view of the side to move
+            move: Best move found (1-7)
+        """
+        bucket = self.entries[mix_key(key) % self.n_buckets]
+        (first_check, first_data), _ = bucket.tolist()
+        first_depth, first_flag, _, _ = self._unpack(first_data)
+        slot = 0 if (first_flag == self.EMPTY or first_check ^ first_data == key
+                     or first_data >> 56 != self.generation or depth >= first_depth) else 1
+        data = self._pack(depth, flag, score, move or 0, self.generation)
+        bucket[slot] = (key ^ data, data)
+
+    def usage(self) -> float:
+        """Fraction of the slots that hold an entry."""
+        flags = (self.entries[:, :, 1] >> np.uint64(40)) & np.uint64(0xFF)
+        return float(np.count_nonzero(flags)) / (self.n_buckets * 2)
+
+    def close(self) -> None:
+        """Detach from the shared memory, and free it if this process created it."""
+        self.entries = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -2,15 +2,50 @@
 
 import sys
 from game.Board import Board
+from game.HumanPlayer import HumanPlayer
 from ui.GameGUI import GameGUI
 from ui.WelcomePage import WelcomePage
-from performance_test import run_performance_test
+from performance_test import run_performance_test, run_engine_benchmark
+from selfplay import run_self_play
+from tournament import run_tournament
+from game.OpeningBook import DEFAULT_BOOK_PATH, generate_opening_book
+from game.Solver import solve
 
 def main():
     # Check for command-line arguments
     if len(sys.argv) > 1 and sys.argv[1] == "--performance-test":
         run_performance_test()
         return
+    if len(sys.argv) > 1 and sys.argv[1] == "--engine-benchmark":
+        run_engine_benchmark()
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--build-book":
+        # optional: number of plies and search depth
+        plies = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+        depth = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+        generate_opening_book(DEFAULT_BOOK_PATH, plies, depth)
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--solve":
+        # optional: the moves played so far, as a string of columns such as 4453
+        board = Board(HumanPlayer(1), HumanPlayer(2))
+        for c in sys.argv[2] if len(sys.argv) > 2 else "":
+            board.make_move(int(c))
+        print({1: "win", 0: "draw", -1: "loss"}[solve(board)], "for the player to move")
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--self-play":
+        # optional: number of games and the depths of both players
+        games = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+        depth1 = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+        depth2 = int(sys.argv[4]) if len(sys.argv) > 4 else depth1
+        run_self_play(games, {"depth": depth1}, {"depth": depth2})
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--tournament":
+        # optional: the depths of A and B and the maximum number of opening pairs
+        depth_a = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+        depth_b = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+        pairs = int(sys.argv[4]) if len(sys.argv) > 4 else 500
+        run_tournament({"depth": depth_a}, {"depth": depth_b}, pairs)
+        return
         
     restart = True
     
@@ -23,13 +23,17 @@ def run_performance_test():
     standard_times = []
     alpha_beta_nodes = []
     alpha_beta_times = []
+    ordered_nodes = []
+    ordering_efficiency = []
     
     # For each depth, run both algorithms and collect stats
     for depth in depths:
         print(f"\nTesting at depth {depth}...")
         
-        # Create a fresh board for each test
-        ai_player = AiPlayer(1, depth)
+        # Create a fresh board for each test, with plain alpha-beta (no
+        # transposition table, tactical pre-pass or move ordering) so that it
+        # searches the same tree as standard minimax, only pruned
+        ai_player = AiPlayer(1, depth, tt_size_mb=0, tactics=False, move_ordering=False)
         human_player = HumanPlayer(2)
         board = Board(ai_player, human_player)
         
@@ -63,10 +67,21 @@ def run_performance_test():
             alpha_beta_times.append(elapsed)
             print(f"  Alpha-Beta pruning: {nodes:,} nodes evaluated in {elapsed:.2f} seconds")
             
+            # Same search with move ordering, to measure the ordering gain
+            ai_player.move_ordering = True
+            _, nodes = ai_player.get_move_with_alpha_beta(board)
+            ai_player.move_ordering = False
+            ordered_nodes.append(nodes)
+            ordering_efficiency.append(ai_player.get_ordering_efficiency())
+            print(f"  Alpha-Beta with move ordering: {nodes:,} nodes evaluated")
+            print(f"  First-move cutoff rate: {ordering_efficiency[-1]:.1%}")
+            
         except KeyboardInterrupt:
             print(f"  Alpha-Beta pruning took too long, skipping...")
             alpha_beta_nodes.append("timeout")
             alpha_beta_times.append(max_time)
+            ordered_nodes.append("timeout")
+            ordering_efficiency.append(0.0)
     
     # Print the final comparison table
     print("\n" + "="*50)
@@ -90,7 +105,8 @@ def run_performance_test():
     
     # Save text results
     txt_filename = os.path.join(results_dir, f"{base_filename}.txt")
-    save_text_results(txt_filename, depths, standard_nodes, standard_times, alpha_beta_nodes, alpha_beta_times)
+    save_text_results(txt_filename, depths, standard_nodes, standard_times, alpha_beta_nodes, alpha_beta_times,
+                      ordered_nodes, ordering_efficiency)
     
     # Save LaTeX results
     latex_filename = os.path.join(results_dir, f"{base_filename}.tex")
@@ -115,7 +131,100 @@ def run_performance_test():
     print("\\end{tabular}")
     print("="*50 + "\n")
 
-def save_text_results(filename, depths, std_nodes, std_times, ab_nodes, ab_times):
+def run_engine_benchmark(depths=(4, 5, 6, 7)):
+    """
+    Compare alpha-beta, PVS and MTD(f) on node counts and wall time.
+    Each engine searches a few fixed positions at increasing depths; MTD(f)
+    is seeded with its value from the previous depth. These engines run with
+    the transposition table, tactical pre-pass and move ordering. Plain
+    alpha-beta (none of them) is run on the Board and on a BitBoard, which
+    search the same tree, to compare their speed in nodes per second. The
+    parallel searches (root splitting and Lazy SMP) run with 1, 2 and 4
+    worker processes; their nodes per worker are listed after the table.
+    """
+    print("\n" + "="*50)
+    print("ENGINE BENCHMARK: ALPHA-BETA VS PVS VS MTD(F)")
+    print("="*50 + "\n")
+    
+    # Opening move sequences (columns 1-7) of the benchmark positions
+    positions = [[], [4, 4, 3, 5], [4, 3, 4, 4, 5, 2, 6]]
+    engines = {
+        "Alpha-Beta full": ("get_move_with_alpha_beta", {}),
+        "Alpha-Beta plain": ("get_move_with_alpha_beta", {"tactics": False, "tt_size_mb": 0, "move_ordering": False}),
+        "Bitboard plain": ("get_move_with_bitboard", {"engine": "bitboard"}),
+        "PVS": ("get_move_with_pvs", {"engine": "pvs"}),
+        "MTD(f)": ("get_move_with_mtdf", {"engine": "mtdf"}),
+        "MTD(f) step 64": ("get_move_with_mtdf", {"engine": "mtdf", "mtdf_step": 64}),
+        "MTD(f) bisect": ("get_move_with_mtdf", {"engine": "mtdf", "mtdf_step": 64, "mtdf_bisect": True}),
+    }
+    for workers in (1, 2, 4):
+        engines[f"Root split x{workers}"] = ("get_move_with_search", {"workers": workers})
+    for workers in (2, 4):
+        engines[f"Lazy SMP x{workers}"] = ("get_move_with_search", {"workers": workers, "parallel": "lazy_smp"})
+    
+    # results[name][depth] = [total nodes, total seconds]
+    results = {name: {depth: [0, 0.0] for depth in depths} for name in engines}
+    # worker_nodes[name] = total nodes of each worker process, over all searches
+    worker_nodes = {}
+    for moves in positions:
+        print(f"Position after moves {moves or '(empty board)'}")
+        for name, (method, options) in engines.items():
+            player1 = AiPlayer(1, depths[0], **options)
+            player2 = AiPlayer(2, depths[0], **options)
+            board = Board(player1, player2)
+            for column in moves:
+                board.make_move(column)
+            ai_player = board.get_current_player()
+            for depth in depths:
+                ai_player.depth = depth
+                start_time = time.time()
+                _, nodes = getattr(ai_player, method)(board)
+                elapsed = time.time() - start_time
+                results[name][depth][0] += nodes
+                results[name][depth][1] += elapsed
+                if ai_player.workers > 1:
+                    totals = worker_nodes.setdefault(name, [0] * ai_player.workers)
+                    for i, n in enumerate(ai_player.worker_nodes):
+                        totals[i] += n
+            player1.close()
+            player2.close()
+            print(f"  {name}: done")
+    
+    header = ("{:<18}".format("Engine") + "".join("{:>22}".format(f"Depth {d} nodes / s") for d in depths)
+              + "{:>12}".format("Nodes/s"))
+    lines = [header, "-" * len(header)]
+    for name in engines:
+        row = "{:<18}".format(name)
+        for depth in depths:
+            nodes, elapsed = results[name][depth]
+            row += "{:>22}".format(f"{nodes:,} / {elapsed:.2f}")
+        total_nodes = sum(nodes for nodes, _ in results[name].values())
+        total_time = sum(elapsed for _, elapsed in results[name].values())
+        row += "{:>12}".format(f"{total_nodes / total_time:,.0f}" if total_time > 0 else "-")
+        lines.append(row)
+    if worker_nodes:
+        lines.append("")
+        lines.append("Nodes per worker (all depths and positions):")
+        for name, totals in worker_nodes.items():
+            lines.append("{:<18}".format(name) + "  ".join(f"{n:,}" for n in totals))
+    print("\n" + "\n".join(lines))
+    
+    results_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "results")
+    os.makedirs(results_dir, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    txt_filename = os.path.join(results_dir, f"engine_benchmark_{timestamp}.txt")
+    with open(txt_filename, 'w') as f:
+        f.write("ENGINE BENCHMARK: ALPHA-BETA VS PVS VS MTD(F)\n")
+        f.write("="*60 + "\n\n")
+        f.write(f"Date and Time: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Python Version: {sys.version}\n")
+        f.write(f"Positions: {positions}\n")
+        f.write("Totals over all positions (nodes / seconds)\n\n")
+        f.write("\n".join(lines) + "\n")
+    print(f"\nResults saved to {txt_filename}")
+
+def save_text_results(filename, depths, std_nodes, std_times, ab_nodes, ab_times,
+                      ordered_nodes=None, ordering_efficiency=None):
     """Save results to a text file in a readable format."""
     with open(filename, 'w') as f:
         f.write("PERFORMANCE TEST RESULTS: MINIMAX VS ALPHA-BETA PRUNING\n")
@@ -144,6 +253,14 @@ def save_text_results(filename, depths, std_nodes, std_times, ab_nodes, ab_times
                 efficiency = std_nodes[i] / ab_nodes[i] if ab_nodes[i] > 0 else float('inf')
                 f.write(f"Depth {depth}: Alpha-Beta evaluates {efficiency:.2f}x fewer nodes than standard Minimax\n")
         
+        if ordered_nodes and ordering_efficiency:
+            f.write("\nMove Ordering:\n")
+            for i, depth in enumerate(depths):
+                if isinstance(ordered_nodes[i], int) and isinstance(ab_nodes[i], int):
+                    gain = ab_nodes[i] / ordered_nodes[i] if ordered_nodes[i] > 0 else float('inf')
+                    f.write(f"Depth {depth}: {ordered_nodes[i]:,} nodes with ordering, {gain:.2f}x fewer than unordered, "
+                            f"{ordering_efficiency[i]:.1%} of cutoffs on the first move\n")
+        
         f.write("\nConclusion:\n")
         f.write("Alpha-Beta pruning significantly reduces the number of nodes evaluated, enabling deeper searches\n")
         f.write("and improved decision-making within the same time constraints compared to standard Minimax.\n")
@@ -0,0 +1,110 @@
+import os
+import sys
+import json
+import time
+import random
+import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Optional
+from game.Board import Board
+from game.AiPlayer import AiPlayer
+
+
+def play_game(index: int, player1: Dict, player2: Dict, opening_plies: int = 4, seed: int = 0) -> Dict:
+    """
+    Play one AI-vs-AI game without a display.
+
+    Args:
+        index: Game number, also used to derive the game's seed
+        player1: AiPlayer keyword arguments of player 1 (who moves first), without player_id
+        player2: AiPlayer keyword arguments of player 2
+        opening_plies: Random moves played before the AIs take over
+        seed: Base seed of the openings and of the AIs' random tie-breaks
+
+    Returns:
+        Record of the game: moves as a string of columns, per-move times (ms)
+        and node counts of the AI moves, and the winner (1, 2, or 0 for a draw)
+    """
+    game_seed = seed * 1_000_003 + index
+    rng = random.Random(game_seed)
+    random.seed(game_seed)
+    board = Board(AiPlayer(1, **player1), AiPlayer(2, **player2))
+    times, nodes = [], []
+    try:
+        while board.total_moves < opening_plies and not board.game_over:
+            board.make_move(rng.choice(board.get_valid_moves()))
+        while not board.game_over:
+            player = board.get_current_player()
+            start_time = time.perf_counter()
+            board.make_move(player.get_move(board))
+            times.append(round((time.perf_counter() - start_time) * 1000, 1))
+            nodes.append(player.nodes_evaluated)
+            if player.ponder:
+                player.start_pondering(board)
+    finally:
+        for player in board.players:
+            player.close()  # worker processes and shared memory of parallel players
+    winner = board.get_winner()
+    return {
+        "game": index,
+        "seed": game_seed,
+        "opening": min(opening_plies, len(board.move_stack)),
+        "moves": "".join(str(c) for c in board.move_stack),
+        "times_ms": times,
+        "nodes": nodes,
+        "winner": winner.player_id if winner else 0,
+        "player1": player1,
+        "player2": player2,
+    }
+
+
+def run_self_play(games: int = 100, player1: Optional[Dict] = None, player2: Optional[Dict] = None,
+                  opening_plies: int = 4, workers: Optional[int] = None, output: Optional[str] = None,
+                  seed: int = 0) -> str:
+    """
+    Play many AI-vs-AI games over a process pool and append them to a JSON lines file,
+    one compact record per game (see play_game), written as soon as each game ends.
+
+    Args:
+        games: Number of games
+        player1: AiPlayer keyword arguments of player 1 (default depth 4)
+        player2: AiPlayer keyword arguments of player 2 (default depth 4)
+        opening_plies: Random moves at the start of every game
+        workers: Worker processes (default: one per CPU)
+        output: File to append to (default: results/selfplay_<timestamp>.jsonl)
+        seed: Base seed; the same seed replays the same openings
+
+    Returns:
+        Path of the output file
+    """
+    player1 = player1 or {"depth": 4}
+    player2 = player2 or {"depth": 4}
+    if output is None:
+        results_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "results")
+        os.makedirs(results_dir, exist_ok=True)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = os.path.join(results_dir, f"selfplay_{timestamp}.jsonl")
+
+    print(f"Playing {games} games: {player1} vs {player2}, {opening_plies} random opening plies")
+    wins = [0, 0, 0]  # draws, player 1 wins, player 2 wins
+    start_time = time.time()
+    with open(output, "a") as f, ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(play_game, i, player1, player2, opening_plies, seed) for i in range(games)]
+        for done, future in enumerate(as_completed(futures), 1):
+            record = future.result()
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            f.flush()
+            wins[record["winner"]] += 1
+            if done % 10 == 0 or done == games:
+                print(f"  {done}/{games} games ({time.time() - start_time:.0f} s): "
+                      f"P1 {wins[1]} / P2 {wins[2]} / draws {wins[0]}")
+    print(f"Games appended to {output}")
+    return output
+
+
+if __name__ == "__main__":
+    # optional: number of games and the depths of both players
+    n_games = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    depth1 = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    depth2 = int(sys.argv[3]) if len(sys.argv) > 3 else depth1
+    run_self_play(n_games, {"depth": depth1}, {"depth": depth2})
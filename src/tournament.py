@@ -0,0 +1,169 @@
+import os
+import sys
+import math
+import time
+import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Optional, Tuple
+from selfplay import play_game
+
+
+def expected_score(elo: float) -> float:
+    """Expected score of a player `elo` points stronger than its opponent."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+# Half a win, a draw and a loss added to every result before estimating the
+# score and its variance, so that a sweep or an all-draw match still has a
+# finite Elo and a non-zero variance
+PSEUDO_COUNT = 0.5
+
+
+def elo_from_score(score: float) -> float:
+    """Elo difference giving an expected score (-inf at 0, +inf at 1)."""
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return 400 * math.log10(score / (1 - score))
+
+
+def _score_and_variance(wins: int, draws: int, losses: int) -> Tuple[float, float]:
+    """Mean and per-game variance of A's score, with PSEUDO_COUNT games of each result added."""
+    wins, draws, losses = wins + PSEUDO_COUNT, draws + PSEUDO_COUNT, losses + PSEUDO_COUNT
+    n = wins + draws + losses
+    score = (wins + draws / 2) / n
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / n
+    return score, variance
+
+
+def elo_estimate(wins: int, draws: int, losses: int, z: float = 1.96) -> Tuple[float, float, float]:
+    """
+    Elo difference of a match result, with a normal-approximation confidence interval.
+
+    Args:
+        wins: Games won by player A
+        draws: Drawn games
+        losses: Games lost by player A
+        z: Quantile of the interval (1.96 for 95 %)
+
+    Returns:
+        Tuple (elo, lower bound, upper bound) for A against B; a bound is
+        infinite when the interval reaches a score of 0 or 1
+    """
+    n = wins + draws + losses
+    if n == 0:
+        return 0.0, -math.inf, math.inf
+    score, variance = _score_and_variance(wins, draws, losses)
+    margin = z * math.sqrt(variance / n)
+    return elo_from_score(score), elo_from_score(score - margin), elo_from_score(score + margin)
+
+
+def sprt_llr(wins: int, draws: int, losses: int, elo0: float, elo1: float) -> float:
+    """
+    Log-likelihood ratio of H1 (A is elo1 stronger) against H0 (A is elo0 stronger),
+    with the usual normal approximation of the trinomial game results.
+
+    Returns:
+        The LLR, 0 before the first game
+    """
+    n = wins + draws + losses
+    if n == 0:
+        return 0.0
+    score, variance = _score_and_variance(wins, draws, losses)
+    s0, s1 = expected_score(elo0), expected_score(elo1)
+    return n * (s1 - s0) * (2 * score - s0 - s1) / (2 * variance)
+
+
+def run_tournament(player_a: Dict, player_b: Dict, max_pairs: int = 500, opening_plies: int = 4,
+                   workers: Optional[int] = None, elo0: float = 0, elo1: float = 50,
+                   alpha: float = 0.05, beta: float = 0.05, seed: int = 0) -> Dict:
+    """
+    Match two AiPlayer configurations over paired openings: every random opening
+    is played twice, once with each configuration moving first. Games run in
+    parallel, and the match stops early once the SPRT of H0 (A is elo0 stronger)
+    against H1 (A is elo1 stronger) accepts one of them.
+
+    Args:
+        player_a: AiPlayer keyword arguments of A (depth, engine, eval_weights, time_limit_ms...)
+        player_b: AiPlayer keyword arguments of B
+        max_pairs: Number of openings if the SPRT never concludes
+        opening_plies: Random moves of each opening
+        workers: Worker processes (default: one per CPU)
+        elo0: Elo difference of the null hypothesis
+        elo1: Elo difference of the alternative hypothesis
+        alpha: Probability of accepting H1 when H0 is true
+        beta: Probability of accepting H0 when H1 is true
+        seed: Base seed of the openings
+
+    Returns:
+        Dictionary with the wins, draws and losses of A, the Elo estimate and
+        its 95 % interval, the final LLR and the SPRT verdict ("H0", "H1" or None)
+    """
+    lower, upper = math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+    wins = draws = losses = 0
+    verdict = None
+    llr = 0.0
+    start_time = time.time()
+    print(f"Tournament: A {player_a} vs B {player_b}")
+    print(f"SPRT elo0={elo0} elo1={elo1} alpha={alpha} beta={beta}, up to {2 * max_pairs} games")
+    pool = ProcessPoolExecutor(workers)
+    try:
+        # future of each game -> player id of A in that game
+        futures = {}
+        for i in range(max_pairs):
+            futures[pool.submit(play_game, i, player_a, player_b, opening_plies, seed)] = 1
+            futures[pool.submit(play_game, i, player_b, player_a, opening_plies, seed)] = 2
+        for future in as_completed(futures):
+            winner = future.result()["winner"]
+            if winner == 0:
+                draws += 1
+            elif winner == futures[future]:
+                wins += 1
+            else:
+                losses += 1
+            llr = sprt_llr(wins, draws, losses, elo0, elo1)
+            games = wins + draws + losses
+            if games % 20 == 0:
+                print(f"  {games} games ({time.time() - start_time:.0f} s): "
+                      f"+{wins} ={draws} -{losses}, LLR {llr:.2f} [{lower:.2f}, {upper:.2f}]")
+            if llr >= upper or llr <= lower:
+                verdict = "H1" if llr >= upper else "H0"
+                break
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+    elo, elo_low, elo_high = elo_estimate(wins, draws, losses)
+    result = {"wins": wins, "draws": draws, "losses": losses, "elo": elo,
+              "elo_interval": (elo_low, elo_high), "llr": llr, "verdict": verdict}
+    summary = [
+        f"A: {player_a}",
+        f"B: {player_b}",
+        f"Games: {wins + draws + losses} (+{wins} ={draws} -{losses} for A)",
+        f"Elo A - B: {elo:+.1f} (95% interval {elo_low:+.1f} to {elo_high:+.1f})",
+        f"SPRT elo0={elo0} elo1={elo1}: LLR {llr:.2f} in [{lower:.2f}, {upper:.2f}], "
+        + ({"H1": "A is stronger (accepted H1)", "H0": "A is not stronger (accepted H0)"}[verdict]
+           if verdict else "inconclusive"),
+    ]
+    print("\n" + "\n".join(summary))
+
+    results_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "results")
+    os.makedirs(results_dir, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    txt_filename = os.path.join(results_dir, f"tournament_{timestamp}.txt")
+    with open(txt_filename, 'w') as f:
+        f.write("TOURNAMENT RESULTS\n")
+        f.write("="*60 + "\n\n")
+        f.write(f"Date and Time: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Openings: {opening_plies} random plies, seed {seed}, colors swapped\n\n")
+        f.write("\n".join(summary) + "\n")
+    print(f"\nResults saved to {txt_filename}")
+    return result
+
+
+if __name__ == "__main__":
+    # optional: depths of A and B and the maximum number of opening pairs
+    depth_a = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    depth_b = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    pairs = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    run_tournament({"depth": depth_a}, {"depth": depth_b}, pairs)
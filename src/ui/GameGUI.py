@@ -1,5 +1,7 @@
 import pygame
+import threading
 from game.Board import Board
+from game.AiPlayer import SearchAborted
 import time
 
 class GameGUI:
@@ -42,6 +44,12 @@ class GameGUI:
         self.turn_count = 1  # Add our own turn counter
         self.ai_thinking = False  # Add a flag to control AI move timing
         self.last_move_time = 0   # Track when the last move was made
+        # Background AI search: the thread, its cancel flag, its (generation, move, error)
+        # result, and a generation number bumped to discard searches of an old game
+        self.ai_thread = None
+        self.ai_cancel = None
+        self.ai_result = None
+        self.ai_generation = 0
         
         # Check if both players are AI and set initial state accordingly
         self.ai_vs_ai = False
@@ -103,6 +111,12 @@ class GameGUI:
             if self.return_to_menu:
                 break
         
+        self._cancel_ai_search()
+        self._stop_pondering()
+        for player in self.game.players:
+            if player.playertype == "AI":
+                player.close()  # worker processes and shared memory of parallel players
+
         # Clean up pygame if we're exiting completely
         if not self.return_to_menu:
             pygame.quit()
@@ -138,11 +152,15 @@ class GameGUI:
         if self.return_button.collidepoint(pos):
             self.button_pressed = True
             self.return_to_menu = True
+            self._cancel_ai_search()
+            self._stop_pondering()
             return
             
         # Check if the reset button was clicked
         if self.reset_button.collidepoint(pos):
             self.reset_button_pressed = True
+            self._cancel_ai_search()
+            self._stop_pondering()
             self.game.reset_game()
             self.turn_count = 1  # Reset turn count to 1 (not 0)
             self.ai_thinking = self.ai_vs_ai  # Resume AI thinking if in AI vs AI mode
@@ -173,6 +191,7 @@ class GameGUI:
                 if success:
                     self.turn_count += 1  # Increment turn count on successful move
                     self.last_move_time = time.time()  # Record when the move was made
+                    self._start_pondering()
                     # Force a render update to show the human move immediately
                     self._render()
                     pygame.display.flip()
@@ -195,6 +214,8 @@ class GameGUI:
         """
         # Example: Reset game when 'r' is pressed
         if key == pygame.K_r:
+            self._cancel_ai_search()
+            self._stop_pondering()
             self.game.reset_game()
             self.turn_count = 0  # Reset turn count
         # Add other key handlers as needed
@@ -205,38 +226,11 @@ class GameGUI:
         if self.game.game_over:
             return
             
-        # If current player is AI, get its move
+        # If current player is AI, search its move in the background and
+        # play it once the search is done
         current_player = self.game.get_current_player()
         if current_player.playertype == "AI" and (self.ai_thinking or self.ai_vs_ai):
-            # Add a small delay before AI move (adjust as needed)
-            if time.time() - self.last_move_time < 0.5:  # 500ms delay
-                return
-                
-            try:
-                move = current_player.get_move(self.game)
-                success = self.game.make_move(move)
-                if success:
-                    self.turn_count += 1  # Increment turn count
-                    self.last_move_time = time.time()
-                    
-                    # Force a render update to show the AI move immediately in AI vs AI mode
-                    if self.ai_vs_ai:
-                        self._render()
-                        pygame.display.flip()
-                
-                # In AI vs AI mode, we always want the next AI to think
-                if self.ai_vs_ai:
-                    next_player = self.game.get_current_player()
-                    if next_player.playertype == "AI" and not self.game.game_over:
-                        self.ai_thinking = True
-                else:
-                    self.ai_thinking = False
-                    
-            except Exception as e:
-                self.show_message(f"AI error: {str(e)}")
-                self.ai_thinking = False
-                if self.ai_vs_ai:  # If in AI vs AI mode, stop automatic play on error
-                    self.ai_vs_ai = False
+            self._update_ai(current_player)
         
         # Check if game is over
         if self.game.check_game_over():
@@ -250,6 +244,107 @@ class GameGUI:
         if self.current_message and time.time() - self.message_start_time > self.message_duration / 1000:
             self.current_message = None
     
+    def _update_ai(self, current_player):
+        """
+        Drive the AI player to move: start its background search, then play
+        its move once the search is done.
+
+        Args:
+            current_player: The AI player to move
+        """
+        if self.ai_thread is None:
+            # Add a small delay before AI move (adjust as needed)
+            if time.time() - self.last_move_time < 0.5:  # 500ms delay
+                return
+            self._start_ai_search(current_player)
+            return
+        if self.ai_thread.is_alive():
+            return  # still thinking: keep the window responsive
+        self.ai_thread = None
+        self.ai_cancel = None
+        current_player.cancel_event = None
+        generation, move, error = self.ai_result
+        self.ai_result = None
+        if generation != self.ai_generation:
+            return  # result of a search from before a reset
+
+        try:
+            if error is not None:
+                raise error
+            success = self.game.make_move(move)
+            if success:
+                self.turn_count += 1  # Increment turn count
+                self.last_move_time = time.time()
+                self._start_pondering()
+                
+                # Force a render update to show the AI move immediately in AI vs AI mode
+                if self.ai_vs_ai:
+                    self._render()
+                    pygame.display.flip()
+            
+            # In AI vs AI mode, we always want the next AI to think
+            if self.ai_vs_ai:
+                next_player = self.game.get_current_player()
+                if next_player.playertype == "AI" and not self.game.game_over:
+                    self.ai_thinking = True
+            else:
+                self.ai_thinking = False
+                
+        except Exception as e:
+            self.show_message(f"AI error: {str(e)}")
+            self.ai_thinking = False
+            if self.ai_vs_ai:  # If in AI vs AI mode, stop automatic play on error
+                self.ai_vs_ai = False
+
+    def _start_ai_search(self, player):
+        """
+        Start searching the AI player's move in a thread, on a snapshot of the board.
+
+        Args:
+            player: The AI player to move
+        """
+        generation = self.ai_generation
+        board = self.game.shallow_copy()
+        self.ai_cancel = threading.Event()
+        player.cancel_event = self.ai_cancel
+
+        def search():
+            try:
+                self.ai_result = (generation, player.get_move(board), None)
+            except SearchAborted:
+                self.ai_result = (generation, None, None)
+            except Exception as e:
+                self.ai_result = (generation, None, e)
+
+        self.ai_thread = threading.Thread(target=search, daemon=True)
+        self.ai_thread.start()
+
+    def _cancel_ai_search(self):
+        """Abort the background AI search, if any, and forget its result."""
+        self.ai_generation += 1
+        if self.ai_thread is not None:
+            self.ai_cancel.set()
+            self.ai_thread.join()
+            for player in self.game.players:
+                if player.playertype == "AI":
+                    player.cancel_event = None
+            self.ai_thread = None
+            self.ai_cancel = None
+        self.ai_result = None
+
+    def _start_pondering(self):
+        """Let AI players that ponder search while their opponent is to move."""
+        current_player = self.game.get_current_player()
+        for player in self.game.players:
+            if player.playertype == "AI" and player.ponder and player is not current_player:
+                player.start_pondering(self.game)
+
+    def _stop_pondering(self):
+        """Stop every background search (before a reset or leaving the game)."""
+        for player in self.game.players:
+            if player.playertype == "AI":
+                player.stop_pondering()
+
     def _render(self):
         """Render the game state to the screen."""
         # Clear screen
@@ -319,6 +414,9 @@ class GameGUI:
         player_color = self.colors['player1'] if current_player.player_id == 1 else self.colors['player2']
         player_text = self.font.render(f"Current: {current_player}", True, player_color)
         self.screen.blit(player_text, (20, 20))
+        if self.ai_thread is not None:
+            thinking_text = self.font.render("Thinking...", True, self.colors['text'])
+            self.screen.blit(thinking_text, (self.width - 200, 20))
         
         # Render turn counter using our own counter
         turn_text = self.font.render(f"Turn: {self.turn_count}", True, self.colors['text'])
@@ -423,10 +423,11 @@ class WelcomePage:
         
         if self.game_mode == 'human_vs_ai':
             player1 = HumanPlayer(1)
-            player2 = AiPlayer(2, self.ai_difficulty_1)
+            player2 = AiPlayer(2, self.ai_difficulty_1, ponder=True)  # think while the human does
         else:  # AI vs AI
-            player1 = AiPlayer(1, self.ai_difficulty_1)
-            player2 = AiPlayer(2, self.ai_difficulty_2)
+            # each AI ponders in its own process while the other one searches
+            player1 = AiPlayer(1, self.ai_difficulty_1, ponder=True)
+            player2 = AiPlayer(2, self.ai_difficulty_2, ponder=True)
 
             
         return {
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The game modules are imported as `game.X` from the src directory, as in main.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from game.Board import Board
+from game.HumanPlayer import HumanPlayer
+
+
+def new_board() -> Board:
+    return Board(HumanPlayer(1), HumanPlayer(2))
+
+
+def random_game(seed: int):
+    """Yield the board after every move of a random game."""
+    rng = random.Random(seed)
+    board = new_board()
+    while not board.game_over:
+        board.play(rng.choice(board.get_valid_moves()))
+        yield board
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_incremental_score_matches_scan(seed):
+    for board in random_game(seed):
+        for pid in (1, 2):
+            assert board.pos_score(pid) == board.scan_pos_score(pid)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_win_detection_matches_full_scan(seed):
+    for board in random_game(seed):
+        if board.winner is not None:
+            winner = board.winner.player_id
+            assert board.detect_win(winner)
+            assert not board.detect_win(3 - winner)
+        else:
+            assert not board.detect_win(1) and not board.detect_win(2)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_zobrist_keys_match_recomputation(seed):
+    for board in random_game(seed):
+        assert board.zobrist_key == board.compute_zobrist_key()
+        assert board.mirror_key == board.compute_zobrist_key(mirrored=True)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_mirrored_game_swaps_keys(seed):
+    *_, board = random_game(seed)
+    moves = list(board.move_stack)
+    played, mirrored = new_board(), new_board()
+    for c in moves:
+        played.play(c)
+        mirrored.play(played.mirror_column(c))
+        assert mirrored.zobrist_key == played.mirror_key
+        assert mirrored.canonical_key()[0] == played.canonical_key()[0]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_undo_restores_incremental_state(seed):
+    board = new_board()
+    rng = random.Random(seed)
+    snapshots = []
+    while not board.game_over:
+        snapshots.append((board.zobrist_key, board.mirror_key, board.scores.copy(),
+                          board.game_state.copy(), board.current_player_idx))
+        board.play(rng.choice(board.get_valid_moves()))
+    while snapshots:
+        board.undo()
+        zobrist_key, mirror_key, scores, game_state, player_idx = snapshots.pop()
+        assert (board.zobrist_key, board.mirror_key, board.scores) == (zobrist_key, mirror_key, scores)
+        assert (board.game_state == game_state).all()
+        assert board.current_player_idx == player_idx
+        assert not board.game_over
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_bitboard_score_matches_board(seed):
+    for board in random_game(seed):
+        if board.game_over:
+            break
+        pid = board.get_current_player().player_id
+        pos = board.to_bitboard()
+        assert pos.relative_score() == board.relative_score(pid)
+        assert pos.relative_score(to_move=False) == board.relative_score(3 - pid)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_bitboard_weighted_score_matches_board(seed):
+    rng = random.Random(seed)
+    weights = ([rng.randrange(-50, 50) for _ in range(4)] + [100_000],
+               [rng.randrange(0, 5) for _ in range(Board.COLUMNS)])
+    tables = Board.evaluation_tables(*weights)
+    for board in random_game(seed):
+        if board.game_over:
+            break
+        pid = board.get_current_player().player_id
+        pos = board.to_bitboard()
+        assert pos.relative_score(weights=weights) == board.vectorized_relative_score(pid, tables)
+        assert pos.relative_score(False, weights) == board.vectorized_relative_score(3 - pid, tables)
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from game.AiPlayer import AiPlayer
+from game.Board import Board
+from game.HumanPlayer import HumanPlayer
+
+ENGINE_CONFIGS = {
+    "pvs": dict(engine="pvs"),
+    "mtdf": dict(engine="mtdf"),
+    "mtdf_step": dict(engine="mtdf", mtdf_step=8),
+    "mtdf_bisect": dict(engine="mtdf", mtdf_step=8, mtdf_bisect=True),
+    "bitboard": dict(engine="bitboard"),
+    "batch_leaves": dict(batch_leaves=True),
+    "no_ordering": dict(move_ordering=False, tt_size_mb=0),
+}
+
+# (seed, plies, depth) of the compared searches
+POSITIONS = [(seed, 2 + seed % 9, 1 + seed % 5) for seed in range(30)]
+
+
+def random_position(seed: int, plies: int) -> Board:
+    """Board after up to `plies` random moves, stopping before the game ends."""
+    rng = random.Random(seed)
+    board = Board(HumanPlayer(1), HumanPlayer(2))
+    for _ in range(plies):
+        column = rng.choice(board.get_valid_moves())
+        board.play(column)
+        if board.game_over:
+            board.undo()
+            break
+    return board
+
+
+def root_score(board: Board, depth: int, **config) -> float:
+    pid = board.get_current_player().player_id
+    player = AiPlayer(pid, depth, tactics=False, endgame_threshold=0, **config)
+    _, score = player._search_root(board, depth)
+    return score
+
+
+@pytest.mark.parametrize("name", ENGINE_CONFIGS)
+@pytest.mark.parametrize("seed, plies, depth", POSITIONS)
+def test_engines_agree_with_minimax(name, seed, plies, depth):
+    board = random_position(seed, plies)
+    moves = list(board.move_stack)
+    expected = root_score(board, depth)
+    assert root_score(board, depth, **ENGINE_CONFIGS[name]) == expected
+    assert list(board.move_stack) == moves
+
+
+@pytest.fixture(scope="module")
+def root_split_players():
+    players = {pid: AiPlayer(pid, 1, tactics=False, endgame_threshold=0, workers=2) for pid in (1, 2)}
+    yield players
+    for player in players.values():
+        player.close()
+
+
+@pytest.mark.parametrize("seed, plies, depth", POSITIONS[::3])
+def test_root_split_agrees_with_single_process(root_split_players, seed, plies, depth):
+    board = random_position(seed, plies)
+    player = root_split_players[board.get_current_player().player_id]
+    player.depth = depth
+    player.new_game()
+    _, score = player._search(board)
+    assert score == root_score(board, depth)
@@ -0,0 +1,130 @@
+import random
+from typing import List
+
+import numpy as np
+import pytest
+
+from game.BitBoard import BitBoard
+from game.Board import Board
+from game.HumanPlayer import HumanPlayer
+from game.Solver import CELLS, SolutionCache, Solver, solve
+from game.TranspositionTable import TranspositionTable
+
+
+def new_board() -> Board:
+    return Board(HumanPlayer(1), HumanPlayer(2))
+
+
+def random_moves(seed: int, empty: int) -> List[int]:
+    """Random game leaving `empty` free cells, nobody having won nor able to win at once."""
+    rng = random.Random(seed)
+    while True:
+        pos, moves = BitBoard(), []
+        while pos.moves < CELLS - empty:
+            columns = [c for c in pos.valid_moves() if not pos.is_winning_move(c)]
+            if not columns:
+                break
+            moves.append(rng.choice(columns))
+            pos.play(moves[-1])
+        else:
+            if not pos.winning_moves():
+                return moves
+
+
+def random_position(seed: int, empty: int) -> BitBoard:
+    pos = BitBoard()
+    for c in random_moves(seed, empty):
+        pos.play(c)
+    return pos
+
+
+def brute_force(pos: BitBoard, memo: dict) -> int:
+    """Exact score of the side to move by plain negamax over every move."""
+    key = pos.key()
+    if key not in memo:
+        best = None
+        for c in pos.valid_moves():
+            if pos.is_winning_move(c):
+                score = (CELLS + 1 - pos.moves) // 2
+            else:
+                child = pos.copy()
+                child.play(c)
+                score = 0 if child.is_full() else -brute_force(child, memo)
+            best = score if best is None else max(best, score)
+        memo[key] = best
+    return memo[key]
+
+
+@pytest.mark.parametrize("seed", range(24))
+def test_solve_matches_brute_force(seed):
+    pos = random_position(seed, 8 + seed % 7)
+    memo = {}
+    expected = brute_force(pos, memo)
+    assert Solver(tt_size_mb=1).solve(pos) == expected
+    assert Solver(tt_size_mb=1).solve(pos, weak=True) == (expected > 0) - (expected < 0)
+    column, score = Solver(tt_size_mb=1).best_move(pos)
+    assert score == expected
+    if not pos.is_winning_move(column):
+        child = pos.copy()
+        child.play(column)
+        assert child.is_full() or -brute_force(child, memo) == expected
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_weak_solve_of_board(seed, tmp_path):
+    board = new_board()
+    for c in random_moves(seed, 12):
+        board.play(c)
+    pos = board.to_bitboard()
+    expected = brute_force(pos, {})
+    expected = (expected > 0) - (expected < 0)
+    path = str(tmp_path / "solutions.sqlite")
+    assert solve(board, cache_path=None, tt_size_mb=1) == expected
+    assert solve(board, cache_path=path, tt_size_mb=1) == expected
+    assert solve(board, cache_path=path, tt_size_mb=1) == expected  # reusing the cache
+
+
+def test_solution_cache_round_trip(tmp_path):
+    path = str(tmp_path / "solutions.sqlite")
+    cache = SolutionCache(path)
+    cache.put(12345, 1)
+    cache.put(67890, -1)
+    assert cache.get(12345) == 1  # still pending
+    cache.flush()
+    assert not cache.pending
+    cache.put(13579, 0)
+    cache.put(67890, 1)  # replaces the stored result
+    cache.close()
+
+    cache = SolutionCache(path)
+    assert (cache.get(12345), cache.get(67890), cache.get(13579)) == (1, 1, 0)
+    assert cache.get(24680) is None
+    assert len(cache) == 3
+    cache.close()
+
+
+class RecordingTable(TranspositionTable):
+    """Transposition table remembering every key stored into it."""
+
+    def __init__(self, size_mb: float):
+        super().__init__(size_mb)
+        self.keys = set()
+
+    def store(self, key, depth, flag, score, move):
+        self.keys.add(key)
+        super().store(key, depth, flag, score, move)
+
+
+def test_solver_entries_spread_over_the_table():
+    board = new_board()
+    for c in "43534253":
+        board.play(int(c))
+    tt = RecordingTable(1)
+    solver = Solver(tt)
+    # the first null-window search only, to keep the test fast
+    solver.negamax(board.to_bitboard(), 0, 1)
+    used = np.count_nonzero((tt.entries["flag"] != TranspositionTable.EMPTY).any(axis=1))
+    # BitBoard keys share their low bits: without mixing they crowd into a few buckets
+    expected = tt.n_buckets * (1 - np.exp(-len(tt.keys) / tt.n_buckets))
+    assert len(tt.keys) > 1000
+    assert used > 0.9 * expected
@@ -0,0 +1,65 @@
+import math
+
+import pytest
+
+from tournament import _score_and_variance, elo_estimate, elo_from_score, expected_score, sprt_llr
+
+# SPRT bounds of run_tournament's defaults (alpha = beta = 0.05)
+LOWER, UPPER = math.log(0.05 / 0.95), math.log(0.95 / 0.05)
+
+
+def sprt_verdict(results: str, elo0: float = 0, elo1: float = 50):
+    """Feed game results ("w", "d" or "l" for A) to the SPRT; (verdict, games played)."""
+    wins = draws = losses = 0
+    for games, result in enumerate(results, 1):
+        wins += result == "w"
+        draws += result == "d"
+        losses += result == "l"
+        llr = sprt_llr(wins, draws, losses, elo0, elo1)
+        if llr >= UPPER:
+            return "H1", games
+        if llr <= LOWER:
+            return "H0", games
+    return None, len(results)
+
+
+def test_score_and_variance_with_pseudo_counts():
+    assert _score_and_variance(0, 0, 0) == pytest.approx((0.5, 1 / 6))
+    score, variance = _score_and_variance(10, 0, 0)
+    assert 0.5 < score < 1 and variance > 0
+    score, variance = _score_and_variance(0, 10, 0)
+    assert score == 0.5 and variance > 0
+
+
+def test_elo_from_score():
+    assert elo_from_score(0.5) == 0
+    assert elo_from_score(0) == -math.inf and elo_from_score(1) == math.inf
+    for elo in (-400, -50, 10, 200):
+        assert elo_from_score(expected_score(elo)) == pytest.approx(elo)
+
+
+def test_elo_estimate():
+    assert elo_estimate(0, 0, 0) == (0.0, -math.inf, math.inf)
+    elo, low, high = elo_estimate(30, 40, 10)
+    assert low < elo < high and elo > 0
+    assert elo_estimate(10, 40, 30) == pytest.approx((-elo, -high, -low))
+    elo, low, high = elo_estimate(20, 0, 0)  # a sweep still has a finite estimate
+    assert 0 < elo < math.inf and low < elo <= high
+    elo, low, high = elo_estimate(0, 50, 0)
+    assert elo == 0 and low < 0 < high
+
+
+def test_sprt_before_the_first_game():
+    assert sprt_llr(0, 0, 0, 0, 50) == 0
+
+
+@pytest.mark.parametrize("results, verdict", [
+    ("w" * 100, "H1"),
+    ("l" * 100, "H0"),
+    ("d" * 100, "H0"),  # equal players: not elo1 stronger
+    ("wwd" * 100, "H1"),
+])
+def test_sprt_concludes(results, verdict):
+    found, games = sprt_verdict(results)
+    assert found == verdict
+    assert games < 30
@@ -0,0 +1,108 @@
+import pickle
+
+import pytest
+
+from game.TranspositionTable import SharedTranspositionTable, TranspositionTable, mix_key
+
+
+@pytest.fixture(params=["local", "shared"])
+def make_table(request):
+    """Factory of empty tables of the parametrized kind, closed after the test."""
+    tables = []
+
+    def make(size_mb: float = 1):
+        table = TranspositionTable(size_mb) if request.param == "local" else SharedTranspositionTable(size_mb)
+        tables.append(table)
+        return table
+
+    yield make
+    for table in tables:
+        if isinstance(table, SharedTranspositionTable):
+            table.close()
+
+
+def test_probe_returns_stored_entry(make_table):
+    tt = make_table()
+    # one key per bucket, so that no entry replaces another
+    buckets = {mix_key(key) % tt.n_buckets: key for key in range(1, 2 ** 64, 2 ** 56 + 12345)}
+    keys = list(buckets.values())
+    for i, key in enumerate(keys):
+        tt.store(key, i % 20, TranspositionTable.EXACT, i * 7 - 500, i % 7 + 1)
+    for i, key in enumerate(keys):
+        assert tt.probe(key) == (i % 20, TranspositionTable.EXACT, i * 7 - 500, i % 7 + 1)
+    assert tt.probe(12345) is None
+    assert tt.hits == len(keys)
+    tt.clear()
+    assert tt.probe(keys[0]) is None
+    assert tt.usage() == 0
+
+
+def test_deepest_entry_keeps_slot_zero(make_table):
+    tt = make_table(0)  # a single bucket: every key collides
+    assert tt.n_buckets == 1
+    tt.store(1, 5, TranspositionTable.EXACT, 10, 4)
+    tt.store(2, 3, TranspositionTable.LOWER, 20, 3)  # shallower: slot 1
+    assert tt.probe(1) == (5, TranspositionTable.EXACT, 10, 4)
+    assert tt.probe(2) == (3, TranspositionTable.LOWER, 20, 3)
+    tt.store(3, 2, TranspositionTable.UPPER, 30, 2)  # slot 1 is always replaced
+    assert tt.probe(2) is None
+    assert tt.probe(1) is not None and tt.probe(3) is not None
+    tt.store(4, 6, TranspositionTable.EXACT, 40, 1)  # deeper: takes slot 0
+    assert tt.probe(1) is None
+    assert tt.probe(4) == (6, TranspositionTable.EXACT, 40, 1)
+    tt.store(4, 1, TranspositionTable.LOWER, 50, 5)  # same key: updated in place
+    assert tt.probe(4) == (1, TranspositionTable.LOWER, 50, 5)
+    assert tt.usage() == 1
+
+
+def test_older_searches_give_up_slot_zero(make_table):
+    tt = make_table(0)
+    tt.store(1, 9, TranspositionTable.EXACT, 10, 4)
+    tt.store(2, 1, TranspositionTable.EXACT, 20, 4)
+    assert tt.probe(1) is not None
+    tt.new_search()
+    tt.store(3, 1, TranspositionTable.EXACT, 30, 4)  # shallower, but slot 0 is from the last search
+    assert tt.probe(1) is None
+    assert tt.probe(2) is not None  # older entries stay readable
+    assert tt.probe(3) == (1, TranspositionTable.EXACT, 30, 4)
+    tt.store(4, 0, TranspositionTable.EXACT, 40, 4)  # slot 0 is current now: slot 1
+    assert tt.probe(3) is not None and tt.probe(2) is None
+
+
+@pytest.mark.parametrize("depth, flag, score, move, age", [
+    (0, TranspositionTable.EXACT, 0, 0, 0),
+    (5, TranspositionTable.LOWER, 100_000, 7, 255),
+    (-1, TranspositionTable.UPPER, -100_000, 1, 3),
+    (127, TranspositionTable.EXACT, -21, 4, 1),
+    (-128, TranspositionTable.LOWER, -2 ** 31, -1, 128),
+    (12, TranspositionTable.UPPER, 2 ** 31 - 1, 3, 17),
+])
+def test_pack_round_trip(depth, flag, score, move, age):
+    data = SharedTranspositionTable._pack(depth, flag, score, move, age)
+    assert 0 <= data < 2 ** 64
+    assert data >> 56 == age
+    assert SharedTranspositionTable._unpack(data) == (depth, flag, score, move)
+
+
+def test_shared_table_is_shared_between_handles():
+    tt = SharedTranspositionTable(1)
+    try:
+        tt.store(42, -3, TranspositionTable.UPPER, -77, 2)
+        attached = pickle.loads(pickle.dumps(tt))
+        assert not attached.owner and attached.name == tt.name
+        assert attached.probe(42) == (-3, TranspositionTable.UPPER, -77, 2)
+        attached.store(43, 4, TranspositionTable.EXACT, 5, 6)
+        attached.close()
+        assert tt.probe(43) == (4, TranspositionTable.EXACT, 5, 6)
+    finally:
+        tt.close()
+
+
+def test_shared_table_rejects_torn_entries():
+    tt = SharedTranspositionTable(0)
+    try:
+        tt.store(42, 3, TranspositionTable.EXACT, 7, 2)
+        tt.entries[0, 0, 1] ^= 1  # data overwritten without its check word
+        assert tt.probe(42) is None
+    finally:
+        tt.close()